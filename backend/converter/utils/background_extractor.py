@@ -6,11 +6,24 @@ Extracts slide backgrounds with full support for:
 - Image backgrounds (original images only, no PNG generation)
 - Background inheritance from layout and master
 """
+import contextlib
+import functools
+import os
 import zipfile
 import xml.etree.ElementTree as ET
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Tuple, TYPE_CHECKING
 from pptx.enum.dml import MSO_FILL_TYPE
 
+if TYPE_CHECKING:
+    from converter.utils.context import ExtractionContext
+
+
+# White/black fallbacks for common scheme color names when the theme mapping misses them
+_SCHEME_FALLBACK = {
+    'lt1': '#ffffff', 'bg1': '#ffffff', 'lt2': '#ffffff', 'bg2': '#ffffff',
+    'dk1': '#000000', 'tx1': '#000000', 'dk2': '#000000', 'tx2': '#000000',
+}
+
 
 def rgb_to_hex(rgb) -> Optional[str]:
     """Convert RGB color to hex string. Returns None if color is invalid."""
@@ -52,6 +65,8 @@ def get_theme_scheme_mapping(pptx_path: str) -> Dict[str, str]:
     Parse theme XML to extract scheme color mappings.
     
     Handles ALL theme colors: accent1-6, bg1-2, dk1-2, lt1-2, tx1-2, sysClr.
+    The result is cached per file version (path, mtime, size), so repeated calls
+    during one extraction pass parse the theme only once. Treat it as read-only.
     
     Args:
         pptx_path: Path to PPTX file (ZIP archive)
@@ -59,6 +74,19 @@ def get_theme_scheme_mapping(pptx_path: str) -> Dict[str, str]:
     Returns:
         Dictionary mapping scheme names to hex colors
     """
+    try:
+        stat = os.stat(pptx_path)
+    except OSError:
+        return _parse_theme_scheme_mapping(pptx_path)
+    return _cached_theme_scheme_mapping(pptx_path, stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_theme_scheme_mapping(pptx_path: str, mtime_ns: int, size: int) -> Dict[str, str]:
+    return _parse_theme_scheme_mapping(pptx_path)
+
+
+def _parse_theme_scheme_mapping(pptx_path: str) -> Dict[str, str]:
     mapping = {}
     
     try:
@@ -109,6 +137,17 @@ def get_theme_scheme_mapping(pptx_path: str) -> Dict[str, str]:
     return mapping
 
 
+def _open_pptx_zip(pptx_path: str, zip_file: Optional[zipfile.ZipFile] = None):
+    """
+    Context manager yielding a ZipFile over the PPTX.
+    A shared zip_file (e.g. ExtractionContext.zip_file) is yielded and left open;
+    otherwise the file is opened here and closed on exit.
+    """
+    if zip_file is not None:
+        return contextlib.nullcontext(zip_file)
+    return zipfile.ZipFile(pptx_path, 'r')
+
+
 def detect_background_type(xml_root) -> str:
     """Detect background type from XML root."""
     for elem in xml_root.iter():
@@ -145,13 +184,8 @@ def extract_color_from_element(color_elem, theme_mapping: Dict[str, str]) -> Tup
             if scheme_name in theme_mapping:
                 return (theme_mapping[scheme_name], scheme_name)
             # Fallbacks for common theme tokens (ensure white/black when mapping missing)
-            lname = scheme_name.lower()
-            if lname in ("lt1", "bg1", "lt2", "bg2"):
-                return ("#ffffff", scheme_name)
-            if lname in ("dk1", "tx1", "dk2", "tx2"):
-                return ("#000000", scheme_name)
-            # Unknown scheme, return placeholder None but keep name so caller can decide
-            return (None, scheme_name)
+            # Unknown scheme returns placeholder None but keeps name so caller can decide
+            return (_SCHEME_FALLBACK.get(scheme_name.lower()), scheme_name)
 
     elif tag_name == 'sysClr':
         last_clr = color_elem.get('lastClr')
@@ -226,7 +260,7 @@ def parse_gradient_fill(fill_elem, theme_mapping: Dict[str, str]) -> Dict[str, A
     return None
 
 
-def parse_image_fill(fill_elem, pptx_path: str, owner_xml_path: str) -> Optional[bytes]:
+def parse_image_fill(fill_elem, pptx_path: str, owner_xml_path: str, zip_file: Optional[zipfile.ZipFile] = None) -> Optional[bytes]:
     """
     Parse image fill from XML element by resolving the correct relationship
     for the owner XML (slide/layout/master). Returns image bytes or None.
@@ -270,7 +304,7 @@ def parse_image_fill(fill_elem, pptx_path: str, owner_xml_path: str) -> Optional
 
         # Fallback: some masters/layouts use different placement; try owner folder rels path first,
         # then try parent 'ppt/_rels' or overall rels if necessary.
-        with zipfile.ZipFile(pptx_path, 'r') as z:
+        with _open_pptx_zip(pptx_path, zip_file) as z:
             # If rels exists, parse it to map rId -> target
             target = None
             if rels_path in z.namelist():
@@ -388,7 +422,7 @@ def parse_pattern_fill(fill_elem, theme_mapping: Dict[str, str]) -> Dict[str, An
     return None
 
 
-def parse_background_from_xml(xml_content: str, theme_mapping: Dict[str, str], pptx_path: Optional[str] = None, owner_xml_path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+def parse_background_from_xml(xml_content: str, theme_mapping: Dict[str, str], pptx_path: Optional[str] = None, owner_xml_path: Optional[str] = None, zip_file: Optional[zipfile.ZipFile] = None) -> Optional[Dict[str, Any]]:
     """
     Parse background from slide/layout/master XML.
     Returns comprehensive background information dictionary.
@@ -431,7 +465,7 @@ def parse_background_from_xml(xml_content: str, theme_mapping: Dict[str, str], p
                 for fill_elem in bg_pr:
                     tag_name = fill_elem.tag.split('}')[-1] if '}' in fill_elem.tag else fill_elem.tag
                     if tag_name == 'blipFill':
-                        image_bytes = parse_image_fill(fill_elem, pptx_path, owner_xml_path)
+                        image_bytes = parse_image_fill(fill_elem, pptx_path, owner_xml_path, zip_file)
                         if image_bytes:
                             return {
                                 "type": "image",
@@ -452,7 +486,7 @@ def parse_background_from_xml(xml_content: str, theme_mapping: Dict[str, str], p
         return None
 
 
-def extract_background_from_slide_xml(pptx_path: str, slide_index: int, theme_mapping: Dict[str, str]) -> Optional[Dict[str, Any]]:
+def extract_background_from_slide_xml(pptx_path: str, slide_index: int, theme_mapping: Dict[str, str], zip_file: Optional[zipfile.ZipFile] = None) -> Optional[Dict[str, Any]]:
     """
     Extract background from slide XML.
     
@@ -460,22 +494,23 @@ def extract_background_from_slide_xml(pptx_path: str, slide_index: int, theme_ma
         pptx_path: Path to PPTX file
         slide_index: Zero-based slide index
         theme_mapping: Theme color mapping dictionary
+        zip_file: Optional already-open ZipFile over the PPTX (left open)
     
     Returns:
         Background dictionary or None
     """
     try:
-        with zipfile.ZipFile(pptx_path, 'r') as z:
+        with _open_pptx_zip(pptx_path, zip_file) as z:
             slide_xml_path = f"ppt/slides/slide{slide_index + 1}.xml"
             if slide_xml_path not in z.namelist():
                 return None
             slide_xml = z.read(slide_xml_path).decode('utf-8', errors='ignore')
-            return parse_background_from_xml(slide_xml, theme_mapping, pptx_path, owner_xml_path=slide_xml_path)
+            return parse_background_from_xml(slide_xml, theme_mapping, pptx_path, owner_xml_path=slide_xml_path, zip_file=zip_file)
     except Exception:
         return None
 
 
-def extract_background_from_layout_xml(pptx_path: str, slide, theme_mapping: Dict[str, str]) -> Optional[Dict[str, Any]]:
+def extract_background_from_layout_xml(pptx_path: str, slide, theme_mapping: Dict[str, str], zip_file: Optional[zipfile.ZipFile] = None) -> Optional[Dict[str, Any]]:
     """
     Extract background from slide layout XML.
     
@@ -483,6 +518,7 @@ def extract_background_from_layout_xml(pptx_path: str, slide, theme_mapping: Dic
         pptx_path: Path to PPTX file
         slide: PowerPoint slide object (to get layout reference)
         theme_mapping: Theme color mapping dictionary
+        zip_file: Optional already-open ZipFile over the PPTX (left open)
     
     Returns:
         Background dictionary or None
@@ -498,16 +534,16 @@ def extract_background_from_layout_xml(pptx_path: str, slide, theme_mapping: Dic
             return None
         layout_path = str(layout_part.partname).lstrip('/')
         
-        with zipfile.ZipFile(pptx_path, 'r') as z:
+        with _open_pptx_zip(pptx_path, zip_file) as z:
             if layout_path not in z.namelist():
                 return None
             layout_xml = z.read(layout_path).decode('utf-8', errors='ignore')
-            return parse_background_from_xml(layout_xml, theme_mapping, pptx_path, owner_xml_path=layout_path)
+            return parse_background_from_xml(layout_xml, theme_mapping, pptx_path, owner_xml_path=layout_path, zip_file=zip_file)
     except Exception:
         return None
 
 
-def extract_background_from_master_xml(pptx_path: str, slide, theme_mapping: Dict[str, str]) -> Optional[Dict[str, Any]]:
+def extract_background_from_master_xml(pptx_path: str, slide, theme_mapping: Dict[str, str], zip_file: Optional[zipfile.ZipFile] = None) -> Optional[Dict[str, Any]]:
     """
     Extract background from slide master XML.
     
@@ -515,6 +551,7 @@ def extract_background_from_master_xml(pptx_path: str, slide, theme_mapping: Dic
         pptx_path: Path to PPTX file
         slide: PowerPoint slide object (to get master reference)
         theme_mapping: Theme color mapping dictionary
+        zip_file: Optional already-open ZipFile over the PPTX (left open)
     
     Returns:
         Background dictionary or None
@@ -533,11 +570,11 @@ def extract_background_from_master_xml(pptx_path: str, slide, theme_mapping: Dic
             return None
         master_path = str(master_part.partname).lstrip('/')
         
-        with zipfile.ZipFile(pptx_path, 'r') as z:
+        with _open_pptx_zip(pptx_path, zip_file) as z:
             if master_path not in z.namelist():
                 return None
             master_xml = z.read(master_path).decode('utf-8', errors='ignore')
-            return parse_background_from_xml(master_xml, theme_mapping, pptx_path, owner_xml_path=master_path)
+            return parse_background_from_xml(master_xml, theme_mapping, pptx_path, owner_xml_path=master_path, zip_file=zip_file)
     except Exception:
         return None
 
@@ -636,7 +673,17 @@ def extract_slide_background_color(slide, pptx_path: Optional[str] = None, slide
     return None
 
 
-def extract_slide_background(slide, pptx_path: Optional[str] = None, slide_index: Optional[int] = None) -> dict:
+def _cached_part_background(ctx: Optional["ExtractionContext"], key, compute) -> Optional[Dict[str, Any]]:
+    """Return compute() memoized in ctx.background_cache under key (uncached without ctx)."""
+    if ctx is None:
+        return compute()
+    cache = ctx.background_cache
+    if key not in cache:
+        cache[key] = compute()
+    return cache[key]
+
+
+def extract_slide_background(slide, pptx_path: Optional[str] = None, slide_index: Optional[int] = None, ctx: Optional["ExtractionContext"] = None) -> dict:
     """
     Extract slide background properties.
     
@@ -649,6 +696,8 @@ def extract_slide_background(slide, pptx_path: Optional[str] = None, slide_index
         slide: PowerPoint slide object
         pptx_path: Path to PPTX file (required for theme color resolution and image extraction)
         slide_index: Zero-based slide index (required for XML parsing)
+        ctx: Optional ExtractionContext; supplies pptx_path, the theme mapping and
+             a shared ZIP handle, and caches layout/master backgrounds across slides
     
     Returns:
         Dictionary with background properties:
@@ -670,7 +719,12 @@ def extract_slide_background(slide, pptx_path: Optional[str] = None, slide_index
     
     # Get theme mapping
     theme_mapping = {}
-    if pptx_path:
+    zip_file = None
+    if ctx is not None:
+        pptx_path = ctx.pptx_path
+        theme_mapping = ctx.theme_mapping
+        zip_file = ctx.zip_file
+    elif pptx_path:
         theme_mapping = get_theme_scheme_mapping(pptx_path)
     
     # Try to extract comprehensive background info
@@ -679,21 +733,27 @@ def extract_slide_background(slide, pptx_path: Optional[str] = None, slide_index
     # STEP 1: Try slide XML (for all types)
     if pptx_path and slide_index is not None:
         try:
-            bg_data = extract_background_from_slide_xml(pptx_path, slide_index, theme_mapping)
+            bg_data = extract_background_from_slide_xml(pptx_path, slide_index, theme_mapping, zip_file)
         except Exception:
             pass
     
-    # STEP 2: Try layout XML
+    # STEP 2: Try layout XML (shared by many slides, cached per layout part)
     if not bg_data and pptx_path:
         try:
-            bg_data = extract_background_from_layout_xml(pptx_path, slide, theme_mapping)
+            bg_data = _cached_part_background(
+                ctx, ('layout', slide.slide_layout.part.partname),
+                lambda: extract_background_from_layout_xml(pptx_path, slide, theme_mapping, zip_file)
+            )
         except Exception:
             pass
     
-    # STEP 3: Try master XML
+    # STEP 3: Try master XML (cached per master part)
     if not bg_data and pptx_path:
         try:
-            bg_data = extract_background_from_master_xml(pptx_path, slide, theme_mapping)
+            bg_data = _cached_part_background(
+                ctx, ('master', slide.slide_layout.slide_master.part.partname),
+                lambda: extract_background_from_master_xml(pptx_path, slide, theme_mapping, zip_file)
+            )
         except Exception:
             pass
     
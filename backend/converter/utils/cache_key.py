@@ -0,0 +1,21 @@
+"""
+Cache keys for extraction results.
+Cached output goes stale when the converter changes, so every on-disk cache
+keys its entries on converter_sources_stamp() as well as on its input.
+"""
+import glob
+import os
+from functools import lru_cache
+
+# Bump whenever the format of cached extraction output changes
+CACHE_VERSION = 1
+
+
+@lru_cache(maxsize=1)
+def converter_sources_stamp() -> str:
+    """CACHE_VERSION plus the mtime of every converter source, so code changes invalidate entries."""
+    converter_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parts = [f"v{CACHE_VERSION}"]
+    for source in sorted(glob.glob(os.path.join(converter_dir, "**", "*.py"), recursive=True)):
+        parts.append(f"{source}|{os.stat(source).st_mtime_ns}")
+    return "\n".join(parts)
@@ -268,7 +268,7 @@ def is_chart_shape(shape):
         return False
 
 
-def extract_charts_from_slide(slide, pptx_path, scale_x=1, scale_y=1):
+def extract_charts_from_slide(slide, pptx_path, scale_x=1, scale_y=1, ctx=None):
     """
     Extract chart elements from a slide object.
     Returns list of element dicts (matching sample_8.json).
@@ -276,14 +276,19 @@ def extract_charts_from_slide(slide, pptx_path, scale_x=1, scale_y=1):
         slide: python-pptx slide object
         pptx_path: path to the PPTX file (we need zip access to read embedded workbooks and chart xml)
         scale_x, scale_y: canvas scaling factors (use your scaling.calculate_scale_factor results)
+        ctx: optional ExtractionContext whose open zip is reused (and left open)
     """
     chart_elements = []
 
-    # open zip once
-    try:
-        z = zipfile.ZipFile(pptx_path, "r")
-    except Exception:
-        z = None
+    # open zip once (or reuse the conversion's shared handle)
+    own_zip = ctx is None
+    if ctx is not None:
+        z = ctx.zip_file
+    else:
+        try:
+            z = zipfile.ZipFile(pptx_path, "r")
+        except Exception:
+            z = None
 
     for shape in slide.shapes:
         # skip non-chart shapes
@@ -344,7 +349,7 @@ def extract_charts_from_slide(slide, pptx_path, scale_x=1, scale_y=1):
         chart_elements.append(elem)
 
     # close zip if opened here
-    if z:
+    if z and own_zip:
         z.close()
 
     return chart_elements
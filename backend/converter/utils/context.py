@@ -0,0 +1,45 @@
+"""
+Per-conversion extraction context.
+Holds the parsed Presentation, one open ZIP handle over the PPTX and the theme
+color mapping, so extractors don't re-open or re-parse the deck for every slide.
+"""
+import zipfile
+from typing import Any, Dict, Optional
+from pptx import Presentation
+from converter.utils.background_extractor import get_theme_scheme_mapping
+
+
+class ExtractionContext:
+    """
+    Shared state for extracting one PPTX file.
+
+    Use as a context manager (or call close()) so the ZIP handle is released:
+
+        with ExtractionContext(pptx_path) as ctx:
+            for slide_idx, slide in enumerate(ctx.prs.slides):
+                ...
+
+    Attributes:
+        pptx_path: Path to the PPTX file
+        prs: python-pptx Presentation for the file
+        zip_file: Open ZipFile over the PPTX (read-only)
+        theme_mapping: Theme scheme color mapping (scheme name -> hex)
+        background_cache: Parsed layout/master backgrounds, keyed by part name
+    """
+
+    def __init__(self, pptx_path: str, prs: Optional[Any] = None):
+        self.pptx_path = pptx_path
+        self.prs = prs if prs is not None else Presentation(pptx_path)
+        self.zip_file = zipfile.ZipFile(pptx_path, 'r')
+        self.theme_mapping: Dict[str, str] = get_theme_scheme_mapping(pptx_path)
+        self.background_cache: Dict[Any, Optional[Dict[str, Any]]] = {}
+
+    def close(self) -> None:
+        """Close the shared ZIP handle."""
+        self.zip_file.close()
+
+    def __enter__(self) -> "ExtractionContext":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
@@ -6,7 +6,7 @@ Presentera canvas is 1024×576 pixels (16:9 aspect ratio).
 
 Scale factor = 1024/720 = 576/405 = 1.4222222
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 
 # Presentera canvas dimensions (from KonvaCanvas.js)
@@ -17,6 +17,14 @@ PRESENTERA_CANVAS_HEIGHT = 576
 DEFAULT_PPT_WIDTH = 720  # points
 DEFAULT_PPT_HEIGHT = 405  # points
 
+# Numeric element properties scaled vertically; everything else in
+# _SCALED_X_PROPERTIES (positions, sizes, font and border sizes) uses scale_x
+_SCALED_Y_PROPERTIES = ('y', 'height')
+_SCALED_X_PROPERTIES = (
+    'x', 'width', 'fontSize', 'borderWidth',
+    'lineHeight', 'letterSpacing', 'padding', 'margin', 'cellWidth', 'cellHeight'
+)
+
 
 def emu_to_points(emu: int) -> float:
     """
@@ -67,37 +75,62 @@ def scale_element_coordinates(
     """
     # Create a copy to avoid modifying the original
     scaled_element = element.copy()
+    _scale_in_place(scaled_element, scale_x, scale_y)
+    return scaled_element
+
+
+def scale_elements(
+    elements: List[Dict[str, Any]],
+    scale_x: float,
+    scale_y: float
+) -> List[Dict[str, Any]]:
+    """
+    Scale a batch of element dictionaries in place.
     
-    # Scale position coordinates and round to nearest integer
-    if 'x' in scaled_element and isinstance(scaled_element['x'], (int, float)):
-        scaled_element['x'] = round(scaled_element['x'] * scale_x)
-    
-    if 'y' in scaled_element and isinstance(scaled_element['y'], (int, float)):
-        scaled_element['y'] = round(scaled_element['y'] * scale_y)
-    
-    # Scale dimensions and round to nearest integer
-    if 'width' in scaled_element and isinstance(scaled_element['width'], (int, float)):
-        scaled_element['width'] = round(scaled_element['width'] * scale_x)
-    
-    if 'height' in scaled_element and isinstance(scaled_element['height'], (int, float)):
-        scaled_element['height'] = round(scaled_element['height'] * scale_y)
-    
-    # Scale font size (text elements) and round to nearest integer
-    if 'fontSize' in scaled_element and isinstance(scaled_element['fontSize'], (int, float)):
-        scaled_element['fontSize'] = round(scaled_element['fontSize'] * scale_x)
-    
-    # Scale border width (shape elements) and round to nearest integer
-    if 'borderWidth' in scaled_element and isinstance(scaled_element['borderWidth'], (int, float)):
-        scaled_element['borderWidth'] = round(scaled_element['borderWidth'] * scale_x)
+    Applies the same rules as scale_element_coordinates without copying each
+    element; use it for freshly built dicts that nothing else references.
     
-    # Scale any other size-related properties that might exist and round to nearest integer
-    # (lineHeight, letterSpacing, padding, etc.)
-    size_properties = ['lineHeight', 'letterSpacing', 'padding', 'margin', 'cellWidth', 'cellHeight']
-    for prop in size_properties:
-        if prop in scaled_element and isinstance(scaled_element[prop], (int, float)):
-            scaled_element[prop] = round(scaled_element[prop] * scale_x)
+    Returns:
+        The same list, for chaining
+    """
+    for element in elements:
+        _scale_in_place(element, scale_x, scale_y)
+    return elements
+
+
+def scale_table_cells(
+    tables: List[Dict[str, Any]],
+    scale_x: float,
+    scale_y: float
+) -> None:
+    """
+    Scale table-specific sizes in place, after scale_elements has run on the tables.
     
-    return scaled_element
+    cellWidth/cellHeight are scaled again here and every cell's fontSize and
+    borderWidth is scaled by scale_x; all values are rounded to integers.
+    """
+    for table in tables:
+        if 'cellWidth' in table:
+            table['cellWidth'] = round(table['cellWidth'] * scale_x)
+        if 'cellHeight' in table:
+            table['cellHeight'] = round(table['cellHeight'] * scale_y)
+        # Flat pass over all cells; every cell dict carries both keys
+        for row in table.get('data', ()):
+            for cell in row:
+                cell['fontSize'] = round(cell['fontSize'] * scale_x)
+                cell['borderWidth'] = round(cell['borderWidth'] * scale_x)
+
+
+def _scale_in_place(element: Dict[str, Any], scale_x: float, scale_y: float) -> None:
+    # Scale numeric properties and round to nearest integer
+    for prop in _SCALED_X_PROPERTIES:
+        value = element.get(prop)
+        if isinstance(value, (int, float)):
+            element[prop] = round(value * scale_x)
+    for prop in _SCALED_Y_PROPERTIES:
+        value = element.get(prop)
+        if isinstance(value, (int, float)):
+            element[prop] = round(value * scale_y)
 
 
 def get_slide_dimensions(presentation) -> tuple:
@@ -5,9 +5,83 @@ Extracts shapes (circles, rectangles, squares, rounded rectangles, lines) with c
 from pptx import Presentation
 from pptx.enum.shapes import MSO_SHAPE_TYPE
 from pptx.enum.dml import MSO_FILL_TYPE, MSO_LINE_DASH_STYLE
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import qn
+from pptx.shapes.autoshape import Shape
+from pptx.shapes.connector import Connector
+import hashlib
+import json
+import os
+import posixpath
+import zipfile
 import uuid
-from typing import List, Dict, Any, Optional
+import itertools
+from collections import namedtuple
+from typing import List, Dict, Any, Optional, TYPE_CHECKING
+from pydantic import TypeAdapter
 from converter.schemas.slide_schema import ShapeElement
+from converter.utils.background_extractor import get_theme_scheme_mapping, _SCHEME_FALLBACK
+from converter.utils.cache_key import converter_sources_stamp
+
+if TYPE_CHECKING:
+    from converter.utils.context import ExtractionContext
+
+
+_NSMAP = {
+    'a': 'http://schemas.openxmlformats.org/drawingml/2006/main',
+    'p': 'http://schemas.openxmlformats.org/presentationml/2006/main',
+}
+
+# Points per EMU (1 inch = 914400 EMU = 72 points)
+_EMU_TO_PT = 72 / 914400
+
+# Fully-qualified spPr tags (p:spPr for slide shapes, a:spPr for DrawingML shapes)
+_SPPR_P = '{http://schemas.openxmlformats.org/presentationml/2006/main}spPr'
+_SPPR_A = '{http://schemas.openxmlformats.org/drawingml/2006/main}spPr'
+
+# Slide-level shape tags visited when streaming slide XML
+_SP = qn('p:sp')
+_CXNSP = qn('p:cxnSp')
+
+# Shape attributes read once per shape and shared by type detection and element building
+_ShapeProbe = namedtuple('ShapeProbe', 'shape_type auto_type width height left top rotation element')
+
+# Dimension-based fallback shape types, indexed by thin * 2 + (not thin) * square
+_DIMENSION_FALLBACK_TYPES = ("rectangle", "circle", "line")
+
+# Batch validator for a slide's worth of shape dicts
+_SHAPE_LIST_ADAPTER = TypeAdapter(List[ShapeElement])
+
+# Two-digit lowercase hex string for each channel value
+_HEX_LUT = tuple(f'{i:02x}' for i in range(256))
+
+# Optional on-disk cache for extract_shapes_from_pptx keeps only the newest files
+SHAPE_CACHE_MAX_ENTRIES = 64
+
+# Shape IDs only need to be unique within a conversion: random run prefix + counter
+_run_id = uuid.uuid4().hex[:8]
+_id_counter = itertools.count()
+
+
+def _reseed_shape_ids() -> None:
+    """Give a forked worker its own run prefix so IDs never collide with the parent's."""
+    global _run_id, _id_counter
+    _run_id = uuid.uuid4().hex[:8]
+    _id_counter = itertools.count()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reseed_shape_ids)
+
+
+def generate_shape_id(use_uuid: bool = False) -> str:
+    """
+    Generate a unique shape element ID.
+    Uses a per-process run prefix and a counter; pass use_uuid=True for a random UUID4.
+    """
+    if use_uuid:
+        return str(uuid.uuid4())
+    return f'{_run_id}-{next(_id_counter):08x}'
 
 
 def emu_to_points(emu: int) -> float:
@@ -50,9 +124,39 @@ def rgb_to_hex(rgb) -> Optional[str]:
     return f"#{r:02x}{g:02x}{b:02x}"
 
 
-def get_shape_type(shape) -> Optional[str]:
+def _probe_shape(shape) -> _ShapeProbe:
+    """
+    Read the shape attributes used for type detection and positioning once.
+    python-pptx computes these properties from XML on every access.
+    """
+    try:
+        shape_type = shape.shape_type if hasattr(shape, 'shape_type') else None
+    except Exception:
+        shape_type = None
+
+    auto_type = None
+    if shape_type == MSO_SHAPE_TYPE.AUTO_SHAPE:
+        try:
+            auto_type = shape.auto_shape_type
+        except Exception:
+            auto_type = None
+
+    return _ShapeProbe(
+        shape_type=shape_type,
+        auto_type=auto_type,
+        width=getattr(shape, 'width', 0),
+        height=getattr(shape, 'height', 0),
+        left=getattr(shape, 'left', 0),
+        top=getattr(shape, 'top', 0),
+        rotation=getattr(shape, 'rotation', None),
+        element=getattr(shape, 'element', None)
+    )
+
+
+def get_shape_type(probe) -> Optional[str]:
     """
-    Determine the shape type from PowerPoint shape.
+    Determine the shape type from a shape probe (see _probe_shape).
+    A python-pptx shape is also accepted and probed on the fly.
     Returns: "circle", "square", "rectangle", "roundedRectangle", "line", 
              "triangle", "star", "pentagon", "hexagon", or None.
     
@@ -63,21 +167,22 @@ def get_shape_type(shape) -> Optional[str]:
                        6=hexagon, 10=star)
     - Fallback: Returns "rectangle" for unrecognized shapes
     """
+    if not isinstance(probe, _ShapeProbe):
+        probe = _probe_shape(probe)
+
     try:
         # Get dimensions for comparison
-        width = shape.width if hasattr(shape, 'width') else 0
-        height = shape.height if hasattr(shape, 'height') else 0
+        width = probe.width or 0
+        height = probe.height or 0
         is_square = abs(width - height) < 1000  # Allow small difference (tolerance)
         
         # Get the shape's type
-        if hasattr(shape, 'shape_type'):
-            shape_type = shape.shape_type
-            
+        shape_type = probe.shape_type
+        if shape_type is not None:
             # Check if it's an auto shape
             if shape_type == MSO_SHAPE_TYPE.AUTO_SHAPE:
-                if hasattr(shape, 'auto_shape_type'):
-                    auto_type = shape.auto_shape_type
-                    
+                auto_type = probe.auto_type
+                if auto_type is not None:
                     # Try to import MSO_SHAPE constants
                     try:
                         from pptx.enum.shapes import MSO_SHAPE
@@ -130,30 +235,11 @@ def get_shape_type(shape) -> Optional[str]:
                 try:
                     point_count = None
                     
-                    # Try python-pptx geometry API first
-                    if hasattr(shape, 'geometry'):
-                        geometry = shape.geometry
-                        if hasattr(geometry, 'paths') and geometry.paths:
-                            # Count points in paths
-                            total_points = 0
-                            for path in geometry.paths:
-                                if hasattr(path, 'points'):
-                                    total_points += len(path.points)
-                            if total_points > 0:
-                                point_count = total_points
-                    
-                    # Fallback: Try XML element parsing
-                    if point_count is None and hasattr(shape, 'element'):
-                        import xml.etree.ElementTree as ET
-                        # Count pathLst/path elements and their segments
-                        for path_elem in shape.element.iter():
-                            tag_name = path_elem.tag.split('}')[-1] if '}' in path_elem.tag else path_elem.tag
-                            if tag_name == 'pathLst' or tag_name == 'path':
-                                # Count children as approximate point count
-                                children = list(path_elem)
-                                if len(children) > 0:
-                                    point_count = len(children)
-                                    break
+                    # Parse the shape XML: count pathLst children as approximate point count
+                    if probe.element is not None:
+                        path_lst = probe.element.find('.//a:pathLst', _NSMAP)
+                        if path_lst is not None and len(path_lst):
+                            point_count = len(path_lst)
                     
                     # Map point count to shape type
                     if point_count == 3:
@@ -178,24 +264,16 @@ def get_shape_type(shape) -> Optional[str]:
                 return None
         
         # Fallback: determine by dimensions and properties
+        # (very thin -> line, square -> circle, else rectangle; indexed without branching)
         if width > 0 and height > 0:
-            # Very thin shape is likely a line
-            if width < 1000 or height < 1000:
-                return "line"
-            # Square dimensions
-            elif is_square:
-                return "circle"  # Default to circle for square shapes
-            # Rectangle
-            else:
-                return "rectangle"
+            thin = int(width < 1000 or height < 1000)
+            return _DIMENSION_FALLBACK_TYPES[thin * 2 + (1 - thin) * int(is_square)]
     
     except Exception as e:
         # If detection fails, try dimension-based fallback
         try:
-            if hasattr(shape, 'width') and hasattr(shape, 'height'):
-                width = shape.width
-                height = shape.height
-                if abs(width - height) < 1000:
+            if probe.width is not None and probe.height is not None:
+                if abs(probe.width - probe.height) < 1000:
                     return "circle"
                 else:
                     return "rectangle"
@@ -225,26 +303,50 @@ def normalize_hex(hex_val: str) -> Optional[str]:
     return None
 
 
-def apply_tint(hex_color: Optional[str], tint_val: int) -> Optional[str]:
+def _tint_shade(rgb: int, tint_val: Optional[int], shade_val: Optional[int]) -> int:
     """
-    Apply tint modifier (exact match from Colab code).
-    OOXML tint val is in 1/100000 units (e.g., 40000 = 40%).
-    Formula: new = orig + (255 - orig) * t
+    Apply tint then shade to a packed 0xRRGGBB value in one pass (None skips a step).
+    Each channel is rounded after each step, matching apply_tint/apply_shade chained.
+    """
+    t = tint_val / 100000.0 if tint_val is not None else None
+    s = shade_val / 100000.0 if shade_val is not None else None
+    out = 0
+    for shift in (16, 8, 0):
+        c = (rgb >> shift) & 0xFF
+        if t is not None:
+            c = int(round(c + (255 - c) * t))
+        if s is not None:
+            c = int(round(c * (1 - s)))
+        out |= (c & 0xFF) << shift
+    return out
+
+
+def _apply_tint_shade(hex_color: Optional[str], tint_val: Optional[int], shade_val: Optional[int]) -> Optional[str]:
     """
-    if hex_color is None or tint_val is None:
+    Apply tint and/or shade modifiers to a #rrggbb color (see _tint_shade).
+    Returns hex_color unchanged when both are None or it cannot be parsed; otherwise
+    the result is lowercase #rrggbb, even for a modifier of 0.
+    """
+    if hex_color is None or (tint_val is None and shade_val is None):
         return hex_color
     
     try:
-        t = tint_val / 100000.0
-        r = int(hex_color[1:3], 16)
-        g = int(hex_color[3:5], 16)
-        b = int(hex_color[5:7], 16)
-        nr = int(round(r + (255 - r) * t))
-        ng = int(round(g + (255 - g) * t))
-        nb = int(round(b + (255 - b) * t))
-        return f'#{nr:02x}{ng:02x}{nb:02x}'
+        rgb = (int(hex_color[1:3], 16) << 16) | (int(hex_color[3:5], 16) << 8) | int(hex_color[5:7], 16)
+        rgb = _tint_shade(rgb, tint_val, shade_val)
     except (ValueError, TypeError):
         return hex_color
+    return '#' + _HEX_LUT[(rgb >> 16) & 0xFF] + _HEX_LUT[(rgb >> 8) & 0xFF] + _HEX_LUT[rgb & 0xFF]
+
+
+def apply_tint(hex_color: Optional[str], tint_val: int) -> Optional[str]:
+    """
+    Apply tint modifier (exact match from Colab code).
+    OOXML tint val is in 1/100000 units (e.g., 40000 = 40%).
+    Formula: new = orig + (255 - orig) * t
+    """
+    if tint_val is None:
+        return hex_color
+    return _apply_tint_shade(hex_color, tint_val, None)
 
 
 def apply_shade(hex_color: Optional[str], shade_val: int) -> Optional[str]:
@@ -252,20 +354,9 @@ def apply_shade(hex_color: Optional[str], shade_val: int) -> Optional[str]:
     Apply shade modifier (exact match from Colab code).
     Formula: new = orig * (1 - s), where s = shade_val/100000
     """
-    if hex_color is None or shade_val is None:
-        return hex_color
-    
-    try:
-        s = shade_val / 100000.0
-        r = int(hex_color[1:3], 16)
-        g = int(hex_color[3:5], 16)
-        b = int(hex_color[5:7], 16)
-        nr = int(round(r * (1 - s)))
-        ng = int(round(g * (1 - s)))
-        nb = int(round(b * (1 - s)))
-        return f'#{nr:02x}{ng:02x}{nb:02x}'
-    except (ValueError, TypeError):
+    if shade_val is None:
         return hex_color
+    return _apply_tint_shade(hex_color, None, shade_val)
 
 
 def find_srgb_in_solidfill(elem) -> Optional[str]:
@@ -344,10 +435,11 @@ def find_scheme_in_solidfill(elem) -> Optional[Dict[str, Any]]:
         return None
 
 
-def extract_shape_fill_color(shape, pptx_path: Optional[str] = None) -> Optional[str]:
+def extract_shape_fill_color(shape, pptx_path: Optional[str] = None, theme_mapping: Optional[Dict[str, str]] = None) -> Optional[str]:
     """
     Extract shape fill color using exact Colab code approach.
     Works directly with shape's spPr XML element (exact match from Colab).
+    A pre-parsed theme_mapping skips the theme lookup for pptx_path.
     """
     try:
         # Get shape's XML element (like Colab code: sp = shape element)
@@ -355,14 +447,11 @@ def extract_shape_fill_color(shape, pptx_path: Optional[str] = None) -> Optional
             return None
 
         sp_elem = shape._element
-        spPr = None
 
-        # Find spPr element
-        for child in sp_elem:
-            tag_name = child.tag.split('}')[-1] if '}' in child.tag else child.tag
-            if tag_name == 'spPr':
-                spPr = child
-                break
+        # Find spPr element (direct child lookup by qualified tag)
+        spPr = sp_elem.find(_SPPR_P)
+        if spPr is None:
+            spPr = sp_elem.find(_SPPR_A)
 
         if spPr is None:
             return None
@@ -378,26 +467,19 @@ def extract_shape_fill_color(shape, pptx_path: Optional[str] = None) -> Optional
             scheme_info = find_scheme_in_solidfill(spPr)
 
         if scheme_info and scheme_info.get('name'):
-            from converter.utils.background_extractor import get_theme_scheme_mapping
-            theme_mapping = get_theme_scheme_mapping(pptx_path)
+            if theme_mapping is None:
+                theme_mapping = get_theme_scheme_mapping(pptx_path)
             base = theme_mapping.get(scheme_info['name']) if theme_mapping else None
 
             # If mapping found, apply tint/shade/lumMod if present
             resolved = base
             if not resolved:
                 # fallback for common tokens
-                name_low = scheme_info['name'].lower()
-                if name_low in ("lt1", "bg1", "lt2", "bg2"):
-                    resolved = "#ffffff"
-                elif name_low in ("dk1", "tx1", "dk2", "tx2"):
-                    resolved = "#000000"
+                resolved = _SCHEME_FALLBACK.get(scheme_info['name'].lower())
 
             if resolved:
-                # Apply tint/shade if provided
-                if scheme_info.get('tint'):
-                    resolved = apply_tint(resolved, scheme_info['tint'])
-                if scheme_info.get('shade'):
-                    resolved = apply_shade(resolved, scheme_info['shade'])
+                # Apply tint/shade if provided (single pass over the channels)
+                resolved = _apply_tint_shade(resolved, scheme_info.get('tint') or None, scheme_info.get('shade') or None)
                 # lumMod is more complex — optionally implement if needed
                 return resolved
 
@@ -410,15 +492,16 @@ def extract_shape_border_color(shape) -> Optional[str]:
     """
     Extract ONLY solid RGB border/stroke color from shape.
     Ignore theme colors.
+    Reads spPr/a:ln/a:solidFill/a:srgbClr directly instead of building shape.line.
     """
     try:
-        if hasattr(shape, "line") and shape.line.color:
-            fc = shape.line.color
-            
-            # MUST be RGB type
-            if getattr(fc, "type", None) == 1:  # MSO_COLOR_TYPE.RGB
-                if hasattr(fc, "rgb") and fc.rgb is not None:
-                    return rgb_to_hex(fc.rgb)
+        ln = shape._element.find('p:spPr/a:ln', _NSMAP)
+        if ln is None:
+            return None
+        
+        srgb = ln.find('a:solidFill/a:srgbClr', _NSMAP)
+        if srgb is not None:
+            return normalize_hex(srgb.get('val'))
     
     except Exception:
         pass
@@ -427,15 +510,13 @@ def extract_shape_border_color(shape) -> Optional[str]:
 
 
 def extract_shape_border_width(shape) -> Optional[float]:
-    """Extract border/stroke width from shape in points"""
+    """Extract border/stroke width from shape in points (reads spPr/a:ln@w directly)"""
     try:
-        if hasattr(shape, 'line'):
-            line = shape.line
-            
-            if hasattr(line, 'width'):
-                width_emu = line.width
-                if width_emu:
-                    return emu_to_points(width_emu)
+        ln = shape._element.find('p:spPr/a:ln', _NSMAP)
+        if ln is not None:
+            width_emu = ln.get('w')
+            if width_emu:
+                return int(width_emu) * _EMU_TO_PT
     
     except Exception:
         pass
@@ -443,37 +524,37 @@ def extract_shape_border_width(shape) -> Optional[float]:
     return 0
 
 
-def treat_freeform_as_rectangle(shape, pptx_path: Optional[str] = None) -> Optional[ShapeElement]:
+def treat_freeform_as_rectangle(shape, pptx_path: Optional[str] = None, probe: Optional[_ShapeProbe] = None, as_dict: bool = False, ctx: Optional["ExtractionContext"] = None) -> Optional[ShapeElement]:
     """
     Treat FREEFORM shape as rectangle (for Canva compatibility).
     
     Args:
         shape: PowerPoint shape object (FREEFORM type)
         pptx_path: Path to PPTX file (for theme color resolution)
+        probe: Pre-read shape attributes (built from shape if omitted)
+        as_dict: If True, return an unvalidated dict shaped like ShapeElement
+        ctx: Optional ExtractionContext (supplies pptx_path and the theme mapping)
     
     Returns:
-        ShapeElement as rectangle or None
+        ShapeElement (or dict) as rectangle or None
     """
     try:
-        # Get position and size
-        left_emu = shape.left
-        top_emu = shape.top
-        width_emu = shape.width
-        height_emu = shape.height
+        if probe is None:
+            probe = _probe_shape(shape)
         
         # Convert to points and round to nearest integer
-        x = round(emu_to_points(left_emu))
-        y = round(emu_to_points(top_emu))
-        width = round(emu_to_points(width_emu))
-        height = round(emu_to_points(height_emu))
+        x = round(emu_to_points(probe.left))
+        y = round(emu_to_points(probe.top))
+        width = round(emu_to_points(probe.width))
+        height = round(emu_to_points(probe.height))
         
         # Get rotation
         rotation = 0
-        if hasattr(shape, 'rotation') and shape.rotation is not None:
-            rotation = int(shape.rotation / 60000)
+        if probe.rotation is not None:
+            rotation = int(probe.rotation / 60000)
         
         # Extract colors (with theme support)
-        fill_color = extract_shape_fill_color(shape, pptx_path)
+        fill_color = _fill_color_with_ctx(shape, pptx_path, ctx)
         border_color = extract_shape_border_color(shape)
         border_width = extract_shape_border_width(shape)
         
@@ -482,25 +563,33 @@ def treat_freeform_as_rectangle(shape, pptx_path: Optional[str] = None) -> Optio
             border_color = "transparent"
         
         # Create rectangle element
-        element = ShapeElement(
-            id=str(uuid.uuid4()),
-            shapeType="rectangle",
-            x=x,
-            y=y,
-            width=width,
-            height=height,
-            fillColor=fill_color,
-            borderColor=border_color,
-            borderWidth=round(border_width) if border_width else 0,
-            rotation=rotation
-        )
+        element = {
+            "id": generate_shape_id(),
+            "type": "shape",
+            "shapeType": "rectangle",
+            "x": x,
+            "y": y,
+            "width": width,
+            "height": height,
+            "fillColor": fill_color,
+            "borderColor": border_color,
+            "borderWidth": round(border_width) if border_width else 0,
+            "rotation": rotation
+        }
         
-        return element
+        return element if as_dict else ShapeElement(**element)
     except Exception:
         return None
 
 
-def extract_shape_from_shape(shape, skip_if_has_text: bool = True, pptx_path: Optional[str] = None) -> Optional[ShapeElement]:
+def _fill_color_with_ctx(shape, pptx_path: Optional[str], ctx: Optional["ExtractionContext"]) -> Optional[str]:
+    """extract_shape_fill_color using the context's path and theme mapping when given."""
+    if ctx is not None:
+        return extract_shape_fill_color(shape, ctx.pptx_path, ctx.theme_mapping)
+    return extract_shape_fill_color(shape, pptx_path)
+
+
+def extract_shape_from_shape(shape, skip_if_has_text: bool = True, pptx_path: Optional[str] = None, as_dict: bool = False, ctx: Optional["ExtractionContext"] = None) -> Optional[ShapeElement]:
     """
     Extract shape element from a single PowerPoint shape.
     Returns ShapeElement if it's a valid shape, None otherwise.
@@ -510,6 +599,9 @@ def extract_shape_from_shape(shape, skip_if_has_text: bool = True, pptx_path: Op
         shape: PowerPoint shape object
         skip_if_has_text: If True, skip shapes that have text content (default: True)
         pptx_path: Path to PPTX file (for theme color resolution)
+        as_dict: If True, return an unvalidated dict shaped like ShapeElement instead
+                 (callers validate a whole batch at once, see extract_shapes_from_pptx)
+        ctx: Optional ExtractionContext (supplies pptx_path and the theme mapping)
     """
     # Skip if shape has text (those are handled by text extractor)
     if skip_if_has_text:
@@ -518,36 +610,32 @@ def extract_shape_from_shape(shape, skip_if_has_text: bool = True, pptx_path: Op
             if shape.has_text_frame and shape.text_frame.text.strip():
                 return None
     
+    # Read shape attributes once for type detection and positioning
+    probe = _probe_shape(shape)
+    
     # Get shape type
-    shape_type = get_shape_type(shape)
+    shape_type = get_shape_type(probe)
     
     # FIX 2: Canva uses FREEFORM shapes - treat as rectangle
-    if shape_type is None and hasattr(shape, 'shape_type'):
-        if shape.shape_type == MSO_SHAPE_TYPE.FREEFORM:
-            return treat_freeform_as_rectangle(shape, pptx_path)
+    if shape_type is None and probe.shape_type == MSO_SHAPE_TYPE.FREEFORM:
+        return treat_freeform_as_rectangle(shape, pptx_path, probe=probe, as_dict=as_dict, ctx=ctx)
     
     if shape_type is None:
         return None
     
-    # Get position and size
-    left_emu = shape.left
-    top_emu = shape.top
-    width_emu = shape.width
-    height_emu = shape.height
-    
     # Convert to points and round to nearest integer
-    x = round(emu_to_points(left_emu))
-    y = round(emu_to_points(top_emu))
-    width = round(emu_to_points(width_emu))
-    height = round(emu_to_points(height_emu))
+    x = round(emu_to_points(probe.left))
+    y = round(emu_to_points(probe.top))
+    width = round(emu_to_points(probe.width))
+    height = round(emu_to_points(probe.height))
     
     # Get rotation (in degrees, PowerPoint uses 60000ths of a degree)
     rotation = 0
-    if hasattr(shape, 'rotation') and shape.rotation is not None:
-        rotation = int(shape.rotation / 60000)
+    if probe.rotation is not None:
+        rotation = int(probe.rotation / 60000)
     
     # Extract colors (with theme support)
-    fill_color = extract_shape_fill_color(shape, pptx_path)
+    fill_color = _fill_color_with_ctx(shape, pptx_path, ctx)
     border_color = extract_shape_border_color(shape)
     border_width = extract_shape_border_width(shape)
     
@@ -556,41 +644,161 @@ def extract_shape_from_shape(shape, skip_if_has_text: bool = True, pptx_path: Op
         border_color = "transparent"
     
     # Create shape element
-    element = ShapeElement(
-        id=str(uuid.uuid4()),
-        shapeType=shape_type,
-        x=x,
-        y=y,
-        width=width,
-        height=height,
-        fillColor=fill_color,
-        borderColor=border_color,
-        borderWidth=round(border_width) if border_width else 0,
-        rotation=rotation
-    )
-    
-    return element
+    element = {
+        "id": generate_shape_id(),
+        "type": "shape",
+        "shapeType": shape_type,
+        "x": x,
+        "y": y,
+        "width": width,
+        "height": height,
+        "fillColor": fill_color,
+        "borderColor": border_color,
+        "borderWidth": round(border_width) if border_width else 0,
+        "rotation": rotation
+    }
+    
+    return element if as_dict else ShapeElement(**element)
+
+
+def _slide_xml_paths(z: zipfile.ZipFile) -> List[str]:
+    """
+    Return slide part names (e.g. "ppt/slides/slide1.xml") in presentation order,
+    resolved through presentation.xml's sldIdLst and its relationships.
+    """
+    presentation = parse_xml(z.read('ppt/presentation.xml'))
+    rels = parse_xml(z.read('ppt/_rels/presentation.xml.rels'))
+    targets = {rel.get('Id'): rel.get('Target') for rel in rels}
+    
+    slide_paths = []
+    for sld_id in presentation.iterfind(f"{qn('p:sldIdLst')}/{qn('p:sldId')}"):
+        target = targets.get(sld_id.get(qn('r:id')))
+        if not target:
+            continue
+        if target.startswith('/'):
+            slide_paths.append(target.lstrip('/'))
+        else:
+            slide_paths.append(posixpath.normpath(posixpath.join('ppt', target)))
+    return slide_paths
+
+
+def _wrap_shape_element(elem):
+    """Wrap a raw p:sp / p:cxnSp element in a lightweight python-pptx shape (no part/parent)."""
+    if elem.tag == _CXNSP:
+        return Connector(elem, None)
+    return Shape(elem, None)
+
+
+def _shape_cache_path(pptx_path: str, cache_dir: str) -> str:
+    """Cache file for a PPTX, keyed by its absolute path, mtime and size and the converter version."""
+    stat = os.stat(pptx_path)
+    key = f"{converter_sources_stamp()}\n{os.path.abspath(pptx_path)}|{stat.st_mtime_ns}|{stat.st_size}"
+    return os.path.join(cache_dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+
+
+def _prune_shape_cache(cache_dir: str, max_entries: int = SHAPE_CACHE_MAX_ENTRIES) -> None:
+    """Delete the least recently used cache files beyond max_entries."""
+    entries = []
+    for name in os.listdir(cache_dir):
+        if not name.endswith(".json"):
+            continue
+        path = os.path.join(cache_dir, name)
+        try:
+            entries.append((os.stat(path).st_mtime_ns, path))
+        except OSError:
+            pass
+    if len(entries) <= max_entries:
+        return
+    entries.sort(reverse=True)
+    for _, path in entries[max_entries:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
 
 
-def extract_shapes_from_pptx(pptx_path: str) -> List[List[Dict[str, Any]]]:
+def extract_shapes_from_pptx(pptx_path: str, cache_dir: Optional[str] = None) -> List[List[Dict[str, Any]]]:
     """
     Extract all shape elements from a PPTX file.
     Returns a list of lists - one list per slide containing shape dictionaries.
+    
+    When cache_dir is given, results are cached there as JSON keyed by the file's
+    (path, mtime, size) and the converter version, so converting an unchanged file
+    again skips extraction. The directory is pruned to the SHAPE_CACHE_MAX_ENTRIES
+    most recently used files. cache_dir=None (the default) disables the cache.
     """
-    prs = Presentation(pptx_path)
+    if cache_dir is None:
+        return _extract_shapes_from_pptx(pptx_path)
+    
+    cache_path = _shape_cache_path(pptx_path, cache_dir)
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            all_slides_shapes = json.load(f)
+        # Refresh the entry's mtime so pruning drops the least recently used files
+        os.utime(cache_path)
+        return all_slides_shapes
+    except (OSError, ValueError):
+        pass
+    
+    all_slides_shapes = _extract_shapes_from_pptx(pptx_path)
+    
+    # Write atomically so concurrent conversions never read a partial file
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(all_slides_shapes, f)
+        os.replace(tmp_path, cache_path)
+        _prune_shape_cache(cache_dir)
+    except OSError:
+        pass
+    
+    return all_slides_shapes
+
+
+def _extract_shapes_from_pptx(pptx_path: str) -> List[List[Dict[str, Any]]]:
+    """
+    Uncached implementation of extract_shapes_from_pptx.
+    
+    Slide XML is read straight from the PPTX archive and only top-level p:sp / p:cxnSp
+    elements are visited. The full python-pptx Presentation is loaded only when a shape
+    has no xfrm of its own (e.g. a placeholder inheriting its position from the layout).
+    """
+    prs = None
     all_slides_shapes = []
     
-    for slide_idx, slide in enumerate(prs.slides):
-        slide_shapes = []
-        
-        # Iterate through all shapes on the slide
-        for shape in slide.shapes:
-            # Extract shape from this shape
-            shape_element = extract_shape_from_shape(shape)
-            if shape_element:
-                slide_shapes.append(shape_element.model_dump())
+    with zipfile.ZipFile(pptx_path, 'r') as z:
+        slide_paths = _slide_xml_paths(z)
         
-        all_slides_shapes.append(slide_shapes)
+        for slide_idx, slide_path in enumerate(slide_paths):
+            slide_shapes = []
+            sp_tree = parse_xml(z.read(slide_path)).find(f"{qn('p:cSld')}/{qn('p:spTree')}")
+            if sp_tree is None:
+                all_slides_shapes.append(slide_shapes)
+                continue
+            
+            pptx_shapes = None
+            for elem in sp_tree:
+                if elem.tag not in (_SP, _CXNSP):
+                    continue
+                
+                shape = _wrap_shape_element(elem)
+                if elem.xfrm is None:
+                    # Position is inherited - resolve the shape through python-pptx
+                    if pptx_shapes is None:
+                        if prs is None:
+                            prs = Presentation(pptx_path)
+                        pptx_shapes = {s.shape_id: s for s in prs.slides[slide_idx].shapes}
+                    shape = pptx_shapes.get(elem.shape_id)
+                    if shape is None:
+                        continue
+                
+                # Extract shape from this shape (plain dict, validated per slide below)
+                shape_element = extract_shape_from_shape(shape, as_dict=True)
+                if shape_element:
+                    slide_shapes.append(shape_element)
+            
+            # Validate and normalize the whole slide in one pydantic-core call
+            all_slides_shapes.append(_SHAPE_LIST_ADAPTER.dump_python(_SHAPE_LIST_ADAPTER.validate_python(slide_shapes)))
     
     return all_slides_shapes
-
@@ -5,10 +5,64 @@ Extracts tables with cell properties, colors, fonts, borders, and alignment.
 from pptx import Presentation
 from pptx.enum.text import PP_ALIGN
 from pptx.enum.shapes import MSO_SHAPE_TYPE
-from pptx.enum.dml import MSO_FILL_TYPE
-import uuid
-from typing import List, Dict, Any, Optional
-from converter.schemas.slide_schema import TableElement, TableCell
+import os
+from typing import List, Dict, Any, Optional, Tuple, TYPE_CHECKING
+from lxml import etree
+from converter.schemas.slide_schema import TableElement
+from converter.utils.background_extractor import get_theme_scheme_mapping, _SCHEME_FALLBACK
+
+if TYPE_CHECKING:
+    from converter.utils.context import ExtractionContext
+
+
+# DrawingML namespace and fully-qualified tags compared against element.tag directly
+_A = 'http://schemas.openxmlformats.org/drawingml/2006/main'
+TAG_SRGB = f'{{{_A}}}srgbClr'
+TAG_SCHEME = f'{{{_A}}}schemeClr'
+TAG_PRST = f'{{{_A}}}prstClr'
+
+# 1 inch = 914400 EMU = 72 points
+_EMU_TO_PT = 72 / 914400
+
+# Common preset (prstClr) colors
+_PRESET_COLOR_MAP = {
+    'black': '#000000',
+    'white': '#FFFFFF',
+    'red': '#FF0000',
+    'green': '#00FF00',
+    'blue': '#0000FF',
+    'yellow': '#FFFF00',
+    'cyan': '#00FFFF',
+    'magenta': '#FF00FF'
+}
+
+# Compiled XPath queries (evaluated by lxml in C)
+_XPATH_NS = {'a': _A}
+# Color of a single run (relative to a:r), for ElementPath find()
+_RUN_FILL_COLOR_PATH = './a:rPr/a:solidFill/*'
+
+# Table structure tags driving the _extract_all_cells walk
+TAG_TR = f'{{{_A}}}tr'
+TAG_TC = f'{{{_A}}}tc'
+TAG_TC_PR = f'{{{_A}}}tcPr'
+TAG_SOLID_FILL = f'{{{_A}}}solidFill'
+TAG_GS = f'{{{_A}}}gs'
+TAG_CELL_BORDERS = frozenset((f'{{{_A}}}lnL', f'{{{_A}}}lnR', f'{{{_A}}}lnT', f'{{{_A}}}lnB'))
+TAG_COLORS = (TAG_SRGB, TAG_SCHEME, TAG_PRST)
+_WALK_TAGS = (TAG_TR, TAG_TC, TAG_TC_PR) + tuple(TAG_CELL_BORDERS) + TAG_COLORS
+
+_XP_FIRST_PPR = etree.XPath('./a:txBody/a:p[1]/a:pPr', namespaces=_XPATH_NS)
+_XP_FIRST_RUN = etree.XPath('./a:txBody/a:p[1]/a:r[1]', namespaces=_XPATH_NS)
+_TAG_LATIN = f'{{{_A}}}latin'
+
+# a:pPr/@algn values -> alignment strings (see get_alignment)
+_ALGN_MAP = {'l': 'left', 'ctr': 'center', 'r': 'right', 'just': 'justify'}
+_XSD_TRUE = ('1', 'true')
+
+
+def _new_id() -> str:
+    """Random 32-hex-char table element ID."""
+    return os.urandom(16).hex()
 
 
 def emu_to_points(emu: int) -> float:
@@ -16,27 +70,22 @@ def emu_to_points(emu: int) -> float:
     Convert EMU (English Metric Units) to points.
     1 inch = 914400 EMU = 72 points
     """
-    return (emu / 914400) * 72
+    return emu * _EMU_TO_PT
 
 
 def rgb_to_hex(rgb) -> str:
     """Convert RGB color to hex string"""
-    if rgb is None:
-        return "#000000"  # Default black
-    
     # Handle different color formats
     if hasattr(rgb, 'rgb'):
         rgb = rgb.rgb
     
     if rgb is None:
-        return "#000000"
+        return "#000000"  # Default black
     
     # Extract RGB values
     if isinstance(rgb, int):
-        # Assume it's a 32-bit integer: 0x00RRGGBB
-        r = (rgb >> 16) & 0xFF
-        g = (rgb >> 8) & 0xFF
-        b = rgb & 0xFF
+        # 32-bit integer: 0x00RRGGBB
+        return f"#{rgb & 0xFFFFFF:06x}"
     elif hasattr(rgb, '__iter__') and len(rgb) >= 3:
         r, g, b = rgb[0], rgb[1], rgb[2]
     else:
@@ -59,286 +108,34 @@ def get_alignment(pp_alignment) -> str:
         return "left"  # Default
 
 
-def extract_cell_fill_color(cell, pptx_path: Optional[str] = None) -> str:
+def _color_from_element(color_elem, theme_mapping: Optional[Dict[str, str]]) -> Optional[str]:
     """
-    Extract fill color from table cell.
-    Supports multiple color formats:
-    - Direct sRGB colors (via python-pptx API and XML)
-    - Theme/scheme colors (via XML parsing with theme mapping)
-    - Gradient fills (uses first stop color)
-    
-    Returns hex color string, defaults to "#FFFFFF" (white) if not found.
+    Resolve an srgbClr/schemeClr/prstClr element to a hex color.
+    Scheme colors are only resolved when a theme mapping is available.
     """
-    # Method 1: Try python-pptx API first (fast path for direct RGB)
-    try:
-        if hasattr(cell, 'fill'):
-            fill = cell.fill
-            if hasattr(fill, 'type'):
-                fill_type = fill.type
-                
-                # Solid fill
-                if fill_type == MSO_FILL_TYPE.SOLID:
-                    if hasattr(fill, 'fore_color'):
-                        try:
-                            fore_color = fill.fore_color
-                            # Try direct RGB first
-                            if fore_color and hasattr(fore_color, 'rgb') and fore_color.rgb is not None:
-                                hex_color = rgb_to_hex(fore_color.rgb)
-                                if hex_color:  # Valid color found
-                                    return hex_color
-                        except (AttributeError, TypeError):
-                            pass
-                
-                # Gradient fill - use first stop color
-                elif fill_type == MSO_FILL_TYPE.GRADIENT:
-                    if hasattr(fill, 'gradient_stops'):
-                        stops = fill.gradient_stops
-                        if stops and len(stops) > 0:
-                            try:
-                                first_stop = stops[0]
-                                if hasattr(first_stop, 'color'):
-                                    color = first_stop.color
-                                    if color and hasattr(color, 'rgb') and color.rgb is not None:
-                                        hex_color = rgb_to_hex(color.rgb)
-                                        if hex_color:
-                                            return hex_color
-                            except (AttributeError, TypeError):
-                                pass
-    except Exception:
-        pass
+    # Direct sRGB color
+    if color_elem.tag == TAG_SRGB:
+        val = color_elem.get('val')
+        if val:
+            # OOXML stores srgbClr/@val as six hex digits without '#'
+            return '#' + val.lower()
     
-    # Method 2: Parse XML directly for theme colors and other formats
-    try:
-        if hasattr(cell, '_element'):
-            elem = cell._element
-            
-            # Table cells store fill in tcPr (table cell properties) > solidFill
-            # First, look for tcPr element
-            tc_pr = None
-            for child in elem:
-                tag_name = child.tag.split('}')[-1] if '}' in child.tag else child.tag
-                if tag_name == 'tcPr':
-                    tc_pr = child
-                    break
-            
-            # If tcPr found, look for solidFill inside it
-            if tc_pr is not None:
-                for fill_elem in tc_pr:
-                    tag_name = fill_elem.tag.split('}')[-1] if '}' in fill_elem.tag else fill_elem.tag
-                    
-                    if tag_name == 'solidFill':
-                        # Found solidFill, now look for color inside it
-                        for color_elem in fill_elem:
-                            color_tag = color_elem.tag.split('}')[-1] if '}' in color_elem.tag else color_elem.tag
-                            
-                            # Direct sRGB color
-                            if color_tag == 'srgbClr':
-                                val = color_elem.get('val')
-                                if val:
-                                    # Ensure hex format
-                                    hex_val = val.lower()
-                                    if not hex_val.startswith('#'):
-                                        hex_val = '#' + hex_val
-                                    return hex_val
-                            
-                            # Theme/scheme color
-                            elif color_tag == 'schemeClr':
-                                scheme_name = color_elem.get('val')
-                                if scheme_name and pptx_path:
-                                    from converter.utils.background_extractor import get_theme_scheme_mapping
-                                    theme_mapping = get_theme_scheme_mapping(pptx_path)
-                                    if scheme_name in theme_mapping:
-                                        return theme_mapping[scheme_name]
-                                    else:
-                                        # fallback
-                                        lname = scheme_name.lower()
-                                        if lname in ("lt1", "bg1", "lt2", "bg2"):
-                                            return "#ffffff"
-                                        if lname in ("dk1", "tx1", "dk2", "tx2"):
-                                            return "#000000"
-                            
-                            # System colors (prstClr) - map common ones
-                            elif color_tag == 'prstClr':
-                                prst_val = color_elem.get('val')
-                                if prst_val:
-                                    # Map common preset colors
-                                    preset_map = {
-                                        'black': '#000000',
-                                        'white': '#FFFFFF',
-                                        'red': '#FF0000',
-                                        'green': '#00FF00',
-                                        'blue': '#0000FF',
-                                        'yellow': '#FFFF00',
-                                        'cyan': '#00FFFF',
-                                        'magenta': '#FF00FF'
-                                    }
-                                    if prst_val.lower() in preset_map:
-                                        return preset_map[prst_val.lower()]
-            
-            # Fallback: search all elements for solidFill (in case structure is different)
-            for fill_elem in elem.iter():
-                tag_name = fill_elem.tag.split('}')[-1] if '}' in fill_elem.tag else fill_elem.tag
-                
-                if tag_name == 'solidFill':
-                    # Found solidFill, now look for color inside it
-                    for color_elem in fill_elem:
-                        color_tag = color_elem.tag.split('}')[-1] if '}' in color_elem.tag else color_elem.tag
-                        
-                        # Direct sRGB color
-                        if color_tag == 'srgbClr':
-                            val = color_elem.get('val')
-                            if val:
-                                hex_val = val.lower()
-                                if not hex_val.startswith('#'):
-                                    hex_val = '#' + hex_val
-                                return hex_val
-                        
-                        # Theme/scheme color
-                        elif color_tag == 'schemeClr':
-                            scheme_name = color_elem.get('val')
-                            if scheme_name and pptx_path:
-                                from converter.utils.background_extractor import get_theme_scheme_mapping
-                                theme_mapping = get_theme_scheme_mapping(pptx_path)
-                                if scheme_name in theme_mapping:
-                                    return theme_mapping[scheme_name]
-                                else:
-                                    # fallback
-                                    lname = scheme_name.lower()
-                                    if lname in ("lt1", "bg1", "lt2", "bg2"):
-                                        return "#ffffff"
-                                    if lname in ("dk1", "tx1", "dk2", "tx2"):
-                                        return "#000000"
-    except Exception:
-        pass
+    # Theme/scheme color
+    elif color_elem.tag == TAG_SCHEME:
+        scheme_name = color_elem.get('val')
+        if scheme_name and theme_mapping is not None:
+            if scheme_name in theme_mapping:
+                return theme_mapping[scheme_name]
+            # fallback
+            return _SCHEME_FALLBACK.get(scheme_name.lower())
     
-    return "#FFFFFF"  # Default white
-
-
-def extract_cell_border_color(cell, pptx_path: Optional[str] = None) -> str:
-    """
-    Extract border color from table cell.
-    Supports multiple color formats via XML parsing.
-    """
-    try:
-        if hasattr(cell, '_element'):
-            elem = cell._element
-            
-            # Table cells have borders defined in tcBdr (table cell borders)
-            # Look for tcBdr element first
-            tc_bdr = None
-            for child in elem:
-                tag_name = child.tag.split('}')[-1] if '}' in child.tag else child.tag
-                if tag_name == 'tcBdr':
-                    tc_bdr = child
-                    break
-            
-            if tc_bdr is None:
-                return "#FFFFFF"
-            
-            # Check each border side (top, bottom, left, right)
-            # Use the first border found (usually all sides have same color)
-            for border_elem in tc_bdr:
-                tag_name = border_elem.tag.split('}')[-1] if '}' in border_elem.tag else border_elem.tag
-                
-                if tag_name in ['top', 'bottom', 'left', 'right']:
-                    # Look for line (ln) element inside border
-                    for ln_elem in border_elem:
-                        ln_tag = ln_elem.tag.split('}')[-1] if '}' in ln_elem.tag else ln_elem.tag
-                        if ln_tag == 'ln':
-                            # Look for color inside line element
-                            for color_elem in ln_elem.iter():
-                                color_tag = color_elem.tag.split('}')[-1] if '}' in color_elem.tag else color_elem.tag
-                                
-                                # Direct sRGB color
-                                if color_tag == 'srgbClr':
-                                    val = color_elem.get('val')
-                                    if val:
-                                        hex_val = val.lower()
-                                        if not hex_val.startswith('#'):
-                                            hex_val = '#' + hex_val
-                                        return hex_val
-                                
-                                # Theme/scheme color
-                                elif color_tag == 'schemeClr':
-                                    scheme_name = color_elem.get('val')
-                                    if scheme_name and pptx_path:
-                                        from converter.utils.background_extractor import get_theme_scheme_mapping
-                                        theme_mapping = get_theme_scheme_mapping(pptx_path)
-                                        if scheme_name in theme_mapping:
-                                            return theme_mapping[scheme_name]
-                                        else:
-                                            # fallback
-                                            lname = scheme_name.lower()
-                                            if lname in ("lt1", "bg1", "lt2", "bg2"):
-                                                return "#ffffff"
-                                            if lname in ("dk1", "tx1", "dk2", "tx2"):
-                                                return "#000000"
-                                
-                                # System colors (prstClr)
-                                elif color_tag == 'prstClr':
-                                    prst_val = color_elem.get('val')
-                                    if prst_val:
-                                        preset_map = {
-                                            'black': '#000000',
-                                            'white': '#FFFFFF',
-                                            'red': '#FF0000',
-                                            'green': '#00FF00',
-                                            'blue': '#0000FF',
-                                            'yellow': '#FFFF00',
-                                            'cyan': '#00FFFF',
-                                            'magenta': '#FF00FF'
-                                        }
-                                        if prst_val.lower() in preset_map:
-                                            return preset_map[prst_val.lower()]
-                            
-                            # If we found a border element but no color, break after first border
-                            break
-                    
-                    # Return after processing first border side
-                    if tag_name in ['top', 'bottom', 'left', 'right']:
-                        break
-    except Exception:
-        pass
+    # System colors (prstClr) - map common ones
+    elif color_elem.tag == TAG_PRST:
+        prst_val = color_elem.get('val')
+        if prst_val:
+            return _PRESET_COLOR_MAP.get(prst_val.lower())
     
-    return "#FFFFFF"  # Default white
-
-
-def extract_cell_border_width(cell) -> float:
-    """Extract border width from table cell in points"""
-    try:
-        if hasattr(cell, '_element'):
-            elem = cell._element
-            # Look for border width in XML
-            # Table cells have borders defined in tcBdr
-            for border_elem in elem.iter():
-                tag_name = border_elem.tag.split('}')[-1] if '}' in border_elem.tag else border_elem.tag
-                
-                # Check for table cell border elements
-                if tag_name in ['top', 'bottom', 'left', 'right', 'ln']:
-                    # Get width attribute (w) - in EMU
-                    width_attr = border_elem.get('w')
-                    if width_attr:
-                        try:
-                            width_emu = int(width_attr)
-                            return emu_to_points(width_emu)
-                        except (ValueError, TypeError):
-                            pass
-                    
-                    # Also check for line width in child elements
-                    for child in border_elem.iter():
-                        child_tag = child.tag.split('}')[-1] if '}' in child.tag else child.tag
-                        if child_tag == 'ln':
-                            width_attr = child.get('w')
-                            if width_attr:
-                                try:
-                                    width_emu = int(width_attr)
-                                    return emu_to_points(width_emu)
-                                except (ValueError, TypeError):
-                                    pass
-    except Exception:
-        pass
-    
-    return 2  # Default border width
+    return None
 
 
 def get_fallback_cell_colors(row_index: int, is_header: bool = False) -> Dict[str, str]:
@@ -378,18 +175,15 @@ def get_fallback_cell_colors(row_index: int, is_header: bool = False) -> Dict[st
             }
 
 
-def extract_cell_properties(cell, pptx_path: Optional[str] = None, row_index: int = 0, is_header: bool = False) -> Dict[str, Any]:
-    """
-    Extract all properties from a table cell.
-    Returns a dictionary with cell properties.
-    """
-    # Default properties
+def _cell_text_properties(tc, fallback_colors: Dict[str, str], style: Tuple[Optional[str], Optional[str], float], theme_mapping: Optional[Dict[str, str]]) -> Dict[str, Any]:
+    """Build the TableCell property dict for an a:tc once its colors are known."""
+    fill, border, border_width = style
     properties = {
-        'text': '',
-        'bgColor': '#FFFFFF',
+        'text': tc.text.strip(),
+        'bgColor': fill if fill is not None else fallback_colors['bgColor'],
         'textColor': '#000000',
-        'borderColor': '#FFFFFF',
-        'borderWidth': 2,
+        'borderColor': border if border is not None else fallback_colors['borderColor'],
+        'borderWidth': round(border_width),
         'fontSize': 12,
         'fontFamily': 'Arial',
         'fontWeight': 'normal',
@@ -398,191 +192,134 @@ def extract_cell_properties(cell, pptx_path: Optional[str] = None, row_index: in
         'align': 'left'
     }
     
-    # Extract text
-    if hasattr(cell, 'text'):
-        properties['text'] = cell.text.strip()
+    # Alignment from first paragraph
+    p_pr = _XP_FIRST_PPR(tc)
+    if p_pr:
+        algn = p_pr[0].get('algn')
+        if algn:
+            properties['align'] = _ALGN_MAP.get(algn, 'left')
     
-    # Extract fill color (background)
-    extracted_bg_color = extract_cell_fill_color(cell, pptx_path)
-    
-    # TEMPORARY FIX: Use fallback colors when extraction returns default white
-    # This handles cases where non-RGB color formats (theme colors) fail to extract
-    # RGB colors will still be extracted correctly and used
-    if extracted_bg_color == "#FFFFFF":
-        # Check if cell actually has a fill - if it does, white might be the real color
-        # If no fill, definitely use fallback
-        has_fill = False
-        try:
-            if hasattr(cell, 'fill'):
-                fill = cell.fill
-                if hasattr(fill, 'type') and fill.type == MSO_FILL_TYPE.SOLID:
-                    has_fill = True
-                    # If it has fill but we got white, check if it's actually a theme color we couldn't resolve
-                    # In that case, use fallback
-                    if hasattr(fill, 'fore_color'):
-                        fore_color = fill.fore_color
-                        # Check if it's a theme color (not RGB)
-                        if fore_color and not (hasattr(fore_color, 'rgb') and fore_color.rgb is not None):
-                            # Likely a theme color that failed to extract - use fallback
-                            has_fill = False
-        except Exception:
-            pass
+    # Font properties from first run of first paragraph
+    run = _XP_FIRST_RUN(tc)
+    if run:
+        run = run[0]
+        r_pr = run.rPr
+        if r_pr is not None:
+            sz = r_pr.get('sz')
+            if sz:
+                properties['fontSize'] = round(int(sz) / 100)
+            latin = r_pr.find(_TAG_LATIN)
+            if latin is not None and latin.get('typeface'):
+                properties['fontFamily'] = latin.get('typeface')
+            if r_pr.get('b') in _XSD_TRUE:
+                properties['fontWeight'] = 'bold'
+            if r_pr.get('i') in _XSD_TRUE:
+                properties['fontStyle'] = 'italic'
+            if r_pr.get('u') not in (None, 'none'):
+                properties['textDecoration'] = 'underline'
         
-        if not has_fill:
-            fallback_colors = get_fallback_cell_colors(row_index, is_header)
-            properties['bgColor'] = fallback_colors['bgColor']
-        else:
-            properties['bgColor'] = extracted_bg_color
-    else:
-        properties['bgColor'] = extracted_bg_color
+        # Text color from the first run only
+        color_elem = run.find(_RUN_FILL_COLOR_PATH, _XPATH_NS)
+        if color_elem is not None:
+            text_color = _color_from_element(color_elem, theme_mapping)
+            if text_color:
+                properties['textColor'] = text_color
     
-    # Extract border color and width
-    extracted_border_color = extract_cell_border_color(cell, pptx_path)
+    return properties
+
+
+def _extract_all_cells(tbl_element, theme_mapping: Optional[Dict[str, str]] = None) -> List[List[Dict[str, Any]]]:
+    """
+    Extract properties for every cell of an a:tbl element in one pass.
+    Returns one list of cell property dicts (TableCell fields) per row.
     
-    # For borders, use fallback white if extraction returned default
-    # (borders in sample_7.json are always white)
-    if extracted_border_color == "#FFFFFF":
-        fallback_colors = get_fallback_cell_colors(row_index, is_header)
-        properties['borderColor'] = fallback_colors['borderColor']
-    else:
-        properties['borderColor'] = extracted_border_color
+    A single iterwalk filtered to rows, cells, tcPr, cell borders and color
+    elements collects each cell's fill and border; the dict is emitted when the a:tc
+    closes. Fill/border results are shared between cells with identical tcPr,
+    whose subtree is then skipped.
+    """
+    style_cache = {}
+    table_rows = []
+    row_data = fallback_colors = None
+    row_idx = -1
     
-    properties['borderWidth'] = round(extract_cell_border_width(cell))
+    # Per-cell state, reset on <a:tc>
+    style_key = None
+    style = None
+    solid_fill = grad_fill = border = border_width = None
+    has_solid = has_border = False
     
-    # Extract text formatting from first paragraph
-    if hasattr(cell, 'text_frame') and cell.text_frame.paragraphs:
-        para = cell.text_frame.paragraphs[0]
+    walker = etree.iterwalk(tbl_element, events=('start', 'end'), tag=_WALK_TAGS)
+    for event, elem in walker:
+        tag = elem.tag
         
-        # Get alignment
-        if para.alignment:
-            properties['align'] = get_alignment(para.alignment)
+        if event == 'end':
+            if tag == TAG_TC:
+                if style is None:
+                    style = (
+                        solid_fill if has_solid else grad_fill,
+                        border,
+                        border_width if border_width is not None else 2
+                    )
+                    style_cache[style_key if style_key is not None else b''] = style
+                row_data.append(_cell_text_properties(elem, fallback_colors, style, theme_mapping))
+            elif tag == TAG_TR:
+                table_rows.append(row_data)
+            continue
         
-        # Get font properties from first run
-        if para.runs:
-            run = para.runs[0]
-            font = run.font
-            
-            # Font size (round to nearest integer)
-            if font.size:
-                properties['fontSize'] = round(font.size.pt)
-            else:
-                properties['fontSize'] = 12
-            
-            # Font family
-            if font.name:
-                properties['fontFamily'] = font.name
-            else:
-                properties['fontFamily'] = 'Arial'
-            
-            # Font weight
-            properties['fontWeight'] = 'bold' if (font.bold is not None and font.bold) else 'normal'
-            
-            # Font style
-            properties['fontStyle'] = 'italic' if (font.italic is not None and font.italic) else 'normal'
-            
-            # Text decoration
-            if hasattr(font, 'underline') and font.underline:
-                properties['textDecoration'] = 'underline'
-            elif hasattr(font, 'strike') and font.strike:
-                properties['textDecoration'] = 'line-through'
-            else:
-                properties['textDecoration'] = 'none'
-            
-                # Text color - try multiple methods
-            try:
-                text_color = None
-                
-                # Method 1: Try python-pptx API (direct RGB)
-                if font.color:
-                    if hasattr(font.color, 'rgb') and font.color.rgb is not None:
-                        text_color = rgb_to_hex(font.color.rgb)
-                
-                # Method 2: Parse XML for theme colors and other formats
-                if not text_color and hasattr(font, '_element'):
-                    font_elem = font._element
-                    # Look for solidFill or color elements
-                    for color_elem in font_elem.iter():
-                        color_tag = color_elem.tag.split('}')[-1] if '}' in color_elem.tag else color_elem.tag
-                        
-                        # Direct sRGB color
-                        if color_tag == 'srgbClr':
-                            val = color_elem.get('val')
-                            if val:
-                                hex_val = val.lower()
-                                if not hex_val.startswith('#'):
-                                    hex_val = '#' + hex_val
-                                text_color = hex_val
-                                break
-                        
-                        # Theme/scheme color
-                        elif color_tag == 'schemeClr':
-                            scheme_name = color_elem.get('val')
-                            if scheme_name and pptx_path:
-                                from converter.utils.background_extractor import get_theme_scheme_mapping
-                                theme_mapping = get_theme_scheme_mapping(pptx_path)
-                                resolved = theme_mapping.get(scheme_name) if theme_mapping else None
-                                if not resolved:
-                                    lname = scheme_name.lower()
-                                    if lname in ("lt1", "bg1", "lt2", "bg2"):
-                                        resolved = "#ffffff"
-                                    elif lname in ("dk1", "tx1", "dk2", "tx2"):
-                                        resolved = "#000000"
-                                if resolved:
-                                    text_color = resolved
-                                    break
-                
-                # Method 3: Also check text_frame XML directly
-                if not text_color and hasattr(cell, 'text_frame') and hasattr(cell.text_frame, '_element'):
-                    tf_elem = cell.text_frame._element
-                    for para_elem in tf_elem.iter():
-                        para_tag = para_elem.tag.split('}')[-1] if '}' in para_elem.tag else para_elem.tag
-                        if para_tag == 'p':
-                            for run_elem in para_elem.iter():
-                                run_tag = run_elem.tag.split('}')[-1] if '}' in run_elem.tag else run_elem.tag
-                                if run_tag == 'r':
-                                    for prop_elem in run_elem.iter():
-                                        prop_tag = prop_elem.tag.split('}')[-1] if '}' in prop_elem.tag else prop_elem.tag
-                                        if prop_tag == 'solidFill':
-                                            for color_elem in prop_elem:
-                                                color_tag = color_elem.tag.split('}')[-1] if '}' in color_elem.tag else color_elem.tag
-                                                if color_tag == 'srgbClr':
-                                                    val = color_elem.get('val')
-                                                    if val:
-                                                        hex_val = val.lower()
-                                                        if not hex_val.startswith('#'):
-                                                            hex_val = '#' + hex_val
-                                                        text_color = hex_val
-                                                        break
-                                                elif color_tag == 'schemeClr':
-                                                    scheme_name = color_elem.get('val')
-                                                    if scheme_name and pptx_path:
-                                                        from converter.utils.background_extractor import get_theme_scheme_mapping
-                                                        theme_mapping = get_theme_scheme_mapping(pptx_path)
-                                                        resolved = theme_mapping.get(scheme_name) if theme_mapping else None
-                                                        if not resolved:
-                                                            lname = scheme_name.lower()
-                                                            if lname in ("lt1", "bg1", "lt2", "bg2"):
-                                                                resolved = "#ffffff"
-                                                            elif lname in ("dk1", "tx1", "dk2", "tx2"):
-                                                                resolved = "#000000"
-                                                        if resolved:
-                                                            text_color = resolved
-                                                            break
-                                    if text_color:
-                                        break
-                            if text_color:
-                                break
-                
-                # Text color extraction is working fine - use extracted color or default black
-                properties['textColor'] = text_color if text_color else '#000000'
-            except (AttributeError, TypeError, Exception):
-                # Default to black on exception (text color extraction is working)
-                properties['textColor'] = '#000000'
+        if tag in TAG_COLORS:
+            parent = elem.getparent()
+            parent_tag = parent.tag
+            if parent_tag == TAG_SOLID_FILL:
+                owner = parent.getparent()
+                owner_tag = owner.tag
+                if owner_tag == TAG_TC_PR:
+                    # Cell fill: tcPr > solidFill
+                    if not has_solid:
+                        has_solid = True
+                        solid_fill = _color_from_element(elem, theme_mapping)
+                elif owner_tag in TAG_CELL_BORDERS:
+                    # Border color: first tcPr > lnL/lnR/lnT/lnB > solidFill color
+                    if not has_border:
+                        has_border = True
+                        border = _color_from_element(elem, theme_mapping)
+            elif parent_tag == TAG_GS:
+                # Gradient fill: first stop's color of tcPr > gradFill > gsLst
+                if (grad_fill is None and parent.getprevious() is None
+                        and parent.getparent().getparent().getparent().tag == TAG_TC_PR):
+                    grad_fill = _color_from_element(elem, theme_mapping)
+        
+        elif tag in TAG_CELL_BORDERS:
+            # Border width (w, EMU): first border line that sets it
+            if border_width is None:
+                width_attr = elem.get('w')
+                if width_attr:
+                    try:
+                        border_width = int(width_attr) * _EMU_TO_PT
+                    except ValueError:
+                        border_width = 2
+        
+        elif tag == TAG_TC:
+            style_key = style = None
+            solid_fill = grad_fill = border = border_width = None
+            has_solid = has_border = False
+        
+        elif tag == TAG_TC_PR:
+            style_key = etree.tostring(elem, method='c14n')
+            style = style_cache.get(style_key)
+            if style is not None:
+                walker.skip_subtree()
+        
+        else:  # TAG_TR
+            row_idx += 1
+            row_data = []
+            # Header row (typically first row) gets the header fallback colors
+            fallback_colors = get_fallback_cell_colors(row_idx, row_idx == 0)
     
-    return properties
+    return table_rows
 
 
-def extract_table_from_shape(shape, pptx_path: Optional[str] = None) -> Optional[TableElement]:
+def extract_table_from_shape(shape, pptx_path: Optional[str] = None, ctx: Optional["ExtractionContext"] = None, as_dict: bool = False) -> Optional[TableElement]:
     """
     Extract table element from a single PowerPoint shape.
     Returns TableElement if it's a valid table, None otherwise.
@@ -590,6 +327,8 @@ def extract_table_from_shape(shape, pptx_path: Optional[str] = None) -> Optional
     Args:
         shape: PowerPoint shape object
         pptx_path: Path to PPTX file (for theme color resolution)
+        ctx: Optional ExtractionContext (its theme mapping is used instead of pptx_path)
+        as_dict: If True, return an unvalidated dict shaped like TableElement
     """
     try:
         # Check if shape has a table
@@ -605,10 +344,10 @@ def extract_table_from_shape(shape, pptx_path: Optional[str] = None) -> Optional
         height_emu = shape.height
         
         # Convert to points and round to nearest integer
-        x = round(emu_to_points(left_emu))
-        y = round(emu_to_points(top_emu))
-        width = round(emu_to_points(width_emu))
-        height = round(emu_to_points(height_emu))
+        x = round(left_emu * _EMU_TO_PT)
+        y = round(top_emu * _EMU_TO_PT)
+        width = round(width_emu * _EMU_TO_PT)
+        height = round(height_emu * _EMU_TO_PT)
         
         # Get rotation
         rotation = 0
@@ -634,51 +373,32 @@ def extract_table_from_shape(shape, pptx_path: Optional[str] = None) -> Optional
         else:
             cell_height = 0
         
-        # Extract cell data
-        table_data = []
-        for row_idx, row in enumerate(table.rows):
-            row_data = []
-            # Determine if this is a header row (typically first row)
-            is_header = (row_idx == 0)
-            
-            for cell in row.cells:
-                # Extract cell properties
-                cell_props = extract_cell_properties(cell, pptx_path, row_index=row_idx, is_header=is_header)
-                
-                # Create TableCell object
-                table_cell = TableCell(
-                    text=cell_props['text'],
-                    bgColor=cell_props['bgColor'],
-                    textColor=cell_props['textColor'],
-                    borderColor=cell_props['borderColor'],
-                    borderWidth=cell_props['borderWidth'],
-                    fontSize=cell_props['fontSize'],
-                    fontFamily=cell_props['fontFamily'],
-                    fontWeight=cell_props['fontWeight'],
-                    fontStyle=cell_props['fontStyle'],
-                    textDecoration=cell_props['textDecoration'],
-                    align=cell_props['align']
-                )
-                row_data.append(table_cell)
-            
-            table_data.append(row_data)
+        # Resolve theme colors once for every cell in the table
+        if ctx is not None:
+            theme_mapping = ctx.theme_mapping
+        else:
+            theme_mapping = get_theme_scheme_mapping(pptx_path) if pptx_path else None
+        
+        # Extract every cell in one pass over the table XML
+        table_data = _extract_all_cells(table._tbl, theme_mapping)
         
         # Create table element
-        element = TableElement(
-            id=str(uuid.uuid4()),
-            x=x,
-            y=y,
-            width=width,
-            height=height,
-            rows=rows,
-            cols=cols,
-            cellWidth=cell_width,
-            cellHeight=cell_height,
-            data=table_data,
-            rotation=rotation
-        )
+        element = {
+            "id": _new_id(),
+            "type": "table",
+            "x": x,
+            "y": y,
+            "width": width,
+            "height": height,
+            "rows": rows,
+            "cols": cols,
+            "cellWidth": cell_width,
+            "cellHeight": cell_height,
+            "data": table_data,
+            "rotation": rotation
+        }
         
-        return element
+        return element if as_dict else TableElement(**element)
     
     except Exception as e:
         # If extraction fails, return None
@@ -5,14 +5,48 @@ Extracts text shapes with coordinates, font properties, alignment, rotation, and
 from pptx import Presentation
 from pptx.enum.text import PP_ALIGN
 from pptx.util import Inches, Pt
-import uuid
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Iterator
+from concurrent.futures import ProcessPoolExecutor
+import os
 from converter.schemas.slide_schema import TextElement
 from converter.utils.shape_extractor import extract_shape_from_shape
 from converter.utils.image_extractor import extract_image_from_shape
-from converter.utils.background_extractor import extract_slide_background
+from converter.utils.background_extractor import extract_slide_background, get_theme_scheme_mapping, _SCHEME_FALLBACK
 from converter.utils.table_extractor import extract_table_from_shape
+from converter.utils.chart_extractor import is_chart_shape, extract_charts_from_slide
+from converter.utils.scaling import get_slide_dimensions, calculate_scale_factor, scale_elements, scale_table_cells
+from converter.utils.context import ExtractionContext
 from pptx.enum.shapes import MSO_SHAPE_TYPE
+from lxml import etree
+
+
+# srgbClr/schemeClr elements under a run's properties, in document order
+_COLOR_XPATH = etree.XPath(
+    './/a:srgbClr|.//a:schemeClr',
+    namespaces={'a': 'http://schemas.openxmlformats.org/drawingml/2006/main'}
+)
+
+# Decks with more slides than this are extracted in a process pool
+PARALLEL_SLIDE_THRESHOLD = 20
+
+# PowerPoint paragraph alignment -> alignment string
+_ALIGN_MAP = {
+    PP_ALIGN.LEFT: "left",
+    PP_ALIGN.CENTER: "center",
+    PP_ALIGN.RIGHT: "right",
+    PP_ALIGN.JUSTIFY: "justify"
+}
+
+# Points per EMU (1 inch = 914400 EMU = 72 points)
+_EMU_TO_PT = 72 / 914400
+
+# Two-digit lowercase hex for every byte value, used by rgb_to_hex
+_HEX256 = tuple(f"{i:02x}" for i in range(256))
+
+
+def _new_id() -> str:
+    """Random 128-bit element ID as 32 hex chars (cheaper than str(uuid.uuid4()))."""
+    return os.urandom(16).hex()
 
 
 def emu_to_points(emu: int) -> float:
@@ -20,21 +54,12 @@ def emu_to_points(emu: int) -> float:
     Convert EMU (English Metric Units) to points.
     1 inch = 914400 EMU = 72 points
     """
-    return (emu / 914400) * 72
+    return emu * _EMU_TO_PT
 
 
 def get_alignment(pp_alignment) -> str:
     """Convert PowerPoint alignment to string"""
-    if pp_alignment == PP_ALIGN.LEFT:
-        return "left"
-    elif pp_alignment == PP_ALIGN.CENTER:
-        return "center"
-    elif pp_alignment == PP_ALIGN.RIGHT:
-        return "right"
-    elif pp_alignment == PP_ALIGN.JUSTIFY:
-        return "justify"
-    else:
-        return "left"  # Default
+    return _ALIGN_MAP.get(pp_alignment, "left")  # Default left
 
 
 def rgb_to_hex(rgb) -> str:
@@ -52,29 +77,114 @@ def rgb_to_hex(rgb) -> str:
     # Extract RGB values
     if isinstance(rgb, int):
         # Assume it's a 32-bit integer: 0x00RRGGBB
-        r = (rgb >> 16) & 0xFF
-        g = (rgb >> 8) & 0xFF
-        b = rgb & 0xFF
+        return "#" + _HEX256[(rgb >> 16) & 0xFF] + _HEX256[(rgb >> 8) & 0xFF] + _HEX256[rgb & 0xFF]
     elif hasattr(rgb, '__iter__') and len(rgb) >= 3:
-        r, g, b = rgb[0], rgb[1], rgb[2]
+        return "#" + _HEX256[rgb[0]] + _HEX256[rgb[1]] + _HEX256[rgb[2]]
     else:
         return "#000000"
+
+
+def _resolve_font_color(font, pptx_path: Optional[str], theme_mapping: Optional[Dict[str, str]] = None) -> Optional[str]:
+    """
+    Resolve a run's text color: direct RGB first, then the first srgbClr or
+    resolvable schemeClr in the run XML. Returns None when nothing resolves.
+    """
+    try:
+        # Prefer direct RGB if available
+        if font.color and getattr(font.color, "type", None) == 1:  # MSO_COLOR_TYPE.RGB
+            if hasattr(font.color, 'rgb') and font.color.rgb is not None:
+                return rgb_to_hex(font.color.rgb)
+        
+        # If no direct RGB, attempt XML theme resolution (but only fallback common tokens)
+        if not pptx_path or not hasattr(font, '_element'):
+            return None
+        for color_elem in _COLOR_XPATH(font._element):
+            val = color_elem.get('val')
+            if not val:
+                continue
+            if etree.QName(color_elem).localname == 'srgbClr':
+                return '#' + val.lower()
+            if theme_mapping is None:
+                theme_mapping = get_theme_scheme_mapping(pptx_path)
+            resolved = theme_mapping.get(val) if theme_mapping else None
+            if not resolved:
+                resolved = _SCHEME_FALLBACK.get(val.lower())
+            if resolved:
+                return resolved
+    except (AttributeError, TypeError):
+        pass
+    return None
+
+
+def _extract_font_properties(font, pptx_path: Optional[str], theme_mapping: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Font size, family, weight, style, decoration and color of a run's font."""
+    # Text decoration (underline, strikethrough)
+    if hasattr(font, 'underline') and font.underline:
+        text_decoration = 'underline'
+    elif hasattr(font, 'strike') and font.strike:
+        text_decoration = 'line-through'
+    else:
+        text_decoration = 'none'
     
-    return f"#{r:02x}{g:02x}{b:02x}"
+    return {
+        # Font size (round to nearest integer)
+        'fontSize': round(font.size.pt) if font.size else 12,
+        'fontFamily': font.name if font.name else 'Arial',
+        'fontWeight': 'bold' if (font.bold is not None and font.bold) else 'normal',
+        'fontStyle': 'italic' if (font.italic is not None and font.italic) else 'normal',
+        'textDecoration': text_decoration,
+        # Color - accept solid RGB, but also resolve theme white/black fallback
+        'color': _resolve_font_color(font, pptx_path, theme_mapping)
+    }
+
+
+def _text_element(content: str, x: int, y: int, width: int, height: int, rotation: int, font_properties: Dict[str, Any]) -> Dict[str, Any]:
+    """TextElement-shaped dict (fields in schema order)."""
+    return {
+        "id": _new_id(),
+        "type": "text",
+        "content": content,
+        "x": x,
+        "y": y,
+        "width": width,
+        "height": height,
+        "fontSize": font_properties['fontSize'],
+        "fontWeight": font_properties['fontWeight'],
+        "fontStyle": font_properties['fontStyle'],
+        "textDecoration": font_properties['textDecoration'],
+        "textAlign": font_properties['textAlign'],
+        "color": font_properties['color'],
+        "rotation": rotation,
+        "fontFamily": font_properties['fontFamily']
+    }
 
 
-def extract_text_from_shape(shape, pptx_path: Optional[str] = None) -> List[TextElement]:
+def extract_text_from_shape(shape, pptx_path: Optional[str] = None, ctx: Optional[ExtractionContext] = None, as_dict: bool = False, frame_text: Optional[str] = None) -> List[TextElement]:
     """
     Extract text elements from a single shape.
     Returns a list of TextElement objects (one per paragraph or text frame).
+    With a ctx, its pptx_path and theme mapping are used for font colors.
+    With as_dict=True, returns unvalidated dicts shaped like TextElement instead.
+    frame_text is the shape's text_frame.text when the caller already read it.
     """
     elements = []
+    theme_mapping = None
+    if ctx is not None:
+        pptx_path = ctx.pptx_path
+        theme_mapping = ctx.theme_mapping
     
     if not shape.has_text_frame:
         return elements
     
     text_frame = shape.text_frame
-    
+    # text_frame.text joins every paragraph on each access; read it once
+    if frame_text is None:
+        frame_text = text_frame.text
+
+    # Empty frames (e.g. unused placeholders) produce no elements; skip geometry work
+    if not frame_text.strip():
+        return elements
+
     # Get shape position and size
     left_emu = shape.left
     top_emu = shape.top
@@ -82,10 +192,10 @@ def extract_text_from_shape(shape, pptx_path: Optional[str] = None) -> List[Text
     height_emu = shape.height
     
     # Convert to points and round to nearest integer
-    x = round(emu_to_points(left_emu))
-    y = round(emu_to_points(top_emu))
-    width = round(emu_to_points(width_emu))
-    height = round(emu_to_points(height_emu))
+    x = round(left_emu * _EMU_TO_PT)
+    y = round(top_emu * _EMU_TO_PT)
+    width = round(width_emu * _EMU_TO_PT)
+    height = round(height_emu * _EMU_TO_PT)
     
     # Get rotation (in degrees, PowerPoint uses 60000ths of a degree)
     rotation = 0
@@ -113,74 +223,7 @@ def extract_text_from_shape(shape, pptx_path: Optional[str] = None) -> List[Text
         # Get paragraph-level properties
         if paragraph.runs:
             first_run = paragraph.runs[0]
-            font = first_run.font
-            
-            # Font size (round to nearest integer)
-            if font.size:
-                font_properties['fontSize'] = round(font.size.pt)
-            else:
-                font_properties['fontSize'] = 12
-            
-            # Font family
-            if font.name:
-                font_properties['fontFamily'] = font.name
-            else:
-                font_properties['fontFamily'] = 'Arial'
-            
-            # Font weight (bold)
-            font_properties['fontWeight'] = 'bold' if (font.bold is not None and font.bold) else 'normal'
-            
-            # Font style (italic)
-            font_properties['fontStyle'] = 'italic' if (font.italic is not None and font.italic) else 'normal'
-            
-            # Text decoration (underline, strikethrough)
-            if hasattr(font, 'underline') and font.underline:
-                font_properties['textDecoration'] = 'underline'
-            elif hasattr(font, 'strike') and font.strike:
-                font_properties['textDecoration'] = 'line-through'
-            else:
-                font_properties['textDecoration'] = 'none'
-            
-            # Color - accept solid RGB, but also resolve theme white/black fallback
-            try:
-                # Prefer direct RGB if available
-                text_color = None
-                if font.color and getattr(font.color, "type", None) == 1:  # MSO_COLOR_TYPE.RGB
-                    if hasattr(font.color, 'rgb') and font.color.rgb is not None:
-                        text_color = rgb_to_hex(font.color.rgb)
-
-                # If no direct RGB, attempt XML theme resolution (but only fallback common tokens)
-                if not text_color and hasattr(font, '_element') and pptx_path:
-                    # Search for srgbClr or schemeClr in run/font XML (like table extractor does)
-                    for color_elem in font._element.iter():
-                        color_tag = color_elem.tag.split('}')[-1] if '}' in color_elem.tag else color_elem.tag
-                        if color_tag == 'srgbClr':
-                            val = color_elem.get('val')
-                            if val:
-                                hex_val = val.lower()
-                                if not hex_val.startswith('#'):
-                                    hex_val = '#' + hex_val
-                                text_color = hex_val
-                                break
-                        elif color_tag == 'schemeClr':
-                            scheme = color_elem.get('val')
-                            if scheme:
-                                from converter.utils.background_extractor import get_theme_scheme_mapping
-                                theme_mapping = get_theme_scheme_mapping(pptx_path)
-                                resolved = theme_mapping.get(scheme) if theme_mapping else None
-                                if not resolved:
-                                    low = scheme.lower()
-                                    if low in ("lt1", "bg1", "lt2", "bg2"):
-                                        resolved = "#ffffff"
-                                    elif low in ("dk1", "tx1", "dk2", "tx2"):
-                                        resolved = "#000000"
-                                if resolved:
-                                    text_color = resolved
-                                    break
-
-                font_properties['color'] = text_color if text_color else None
-            except (AttributeError, TypeError):
-                font_properties['color'] = None
+            font_properties.update(_extract_font_properties(first_run.font, pptx_path, theme_mapping))
         
         # Text alignment
         if paragraph.alignment:
@@ -195,232 +238,166 @@ def extract_text_from_shape(shape, pptx_path: Optional[str] = None) -> List[Text
         
         if para_full_text.strip():
             # Create element for this paragraph
-            element = TextElement(
-                id=str(uuid.uuid4()),
-                content=para_full_text,
-                x=x,
-                y=y,
-                width=width,
-                height=height,
-                fontSize=font_properties['fontSize'],
-                fontFamily=font_properties['fontFamily'],
-                fontWeight=font_properties['fontWeight'],
-                fontStyle=font_properties['fontStyle'],
-                textDecoration=font_properties['textDecoration'],
-                textAlign=font_properties['textAlign'],
-                color=font_properties['color'],
-                rotation=rotation
-            )
-            elements.append(element)
+            elements.append(_text_element(para_full_text, x, y, width, height, rotation, font_properties))
     
-    # If no paragraphs but shape has text, extract as single element
-    if not elements and text_frame.text.strip():
-        # Try to get default font properties from shape
-        if text_frame.paragraphs:
-            para = text_frame.paragraphs[0]
-            if para.runs:
-                run = para.runs[0]
-                font = run.font
-                
-                font_properties['fontSize'] = round(font.size.pt) if font.size else 12
-                font_properties['fontFamily'] = font.name if font.name else 'Arial'
-                font_properties['fontWeight'] = 'bold' if (font.bold is not None and font.bold) else 'normal'
-                font_properties['fontStyle'] = 'italic' if (font.italic is not None and font.italic) else 'normal'
-                
-                # Text decoration
-                if hasattr(font, 'underline') and font.underline:
-                    font_properties['textDecoration'] = 'underline'
-                elif hasattr(font, 'strike') and font.strike:
-                    font_properties['textDecoration'] = 'line-through'
-                else:
-                    font_properties['textDecoration'] = 'none'
-                
-                # Color - accept solid RGB, but also resolve theme white/black fallback
-                try:
-                    # Prefer direct RGB if available
-                    text_color = None
-                    if font.color and getattr(font.color, "type", None) == 1:  # MSO_COLOR_TYPE.RGB
-                        if hasattr(font.color, 'rgb') and font.color.rgb is not None:
-                            text_color = rgb_to_hex(font.color.rgb)
-
-                    # If no direct RGB, attempt XML theme resolution (but only fallback common tokens)
-                    if not text_color and hasattr(font, '_element') and pptx_path:
-                        # Search for srgbClr or schemeClr in run/font XML (like table extractor does)
-                        for color_elem in font._element.iter():
-                            color_tag = color_elem.tag.split('}')[-1] if '}' in color_elem.tag else color_elem.tag
-                            if color_tag == 'srgbClr':
-                                val = color_elem.get('val')
-                                if val:
-                                    hex_val = val.lower()
-                                    if not hex_val.startswith('#'):
-                                        hex_val = '#' + hex_val
-                                    text_color = hex_val
-                                    break
-                            elif color_tag == 'schemeClr':
-                                scheme = color_elem.get('val')
-                                if scheme:
-                                    from converter.utils.background_extractor import get_theme_scheme_mapping
-                                    theme_mapping = get_theme_scheme_mapping(pptx_path)
-                                    resolved = theme_mapping.get(scheme) if theme_mapping else None
-                                    if not resolved:
-                                        low = scheme.lower()
-                                        if low in ("lt1", "bg1", "lt2", "bg2"):
-                                            resolved = "#ffffff"
-                                        elif low in ("dk1", "tx1", "dk2", "tx2"):
-                                            resolved = "#000000"
-                                    if resolved:
-                                        text_color = resolved
-                                        break
-
-                    font_properties['color'] = text_color if text_color else None
-                except (AttributeError, TypeError):
-                    font_properties['color'] = None
-            
-            # Alignment
-            if para.alignment:
-                font_properties['textAlign'] = get_alignment(para.alignment)
-            else:
-                font_properties['textAlign'] = 'left'
+    # Paragraphs holding only fields (e.g. slide numbers) have no runs; emit the frame text
+    if not elements:
+        elements.append(_text_element(frame_text, x, y, width, height, rotation, font_properties))
+    
+    if as_dict:
+        return elements
+    return [TextElement(**element) for element in elements]
+
+
+def _process_slide(slide, slide_idx: int, ctx: ExtractionContext, scale_x: float, scale_y: float) -> Dict[str, Any]:
+    """Extract and scale all elements and the background of one slide."""
+    # Element dicts are collected unscaled and scaled together after the shape loop
+    slide_elements = []
+    slide_tables = []
+    
+    # Iterate through all shapes on the slide
+    for shape_idx, shape in enumerate(slide.shapes):
+        # Check if shape is a table first (tables should be extracted separately)
+        if getattr(shape, 'has_table', False):
+            table_dict = extract_table_from_shape(shape, ctx=ctx, as_dict=True)
+            if table_dict:
+                slide_elements.append(table_dict)
+                slide_tables.append(table_dict)
+                continue  # Skip other extraction for table shapes
+        
+        # Extract image (images are separate from text/shapes)
+        image_element = extract_image_from_shape(shape)
+        if image_element:
+            slide_elements.append(image_element.model_dump())
+            continue  # Skip text/shape extraction for image shapes
+        
+        # Read the shape's text/type flags once; python-pptx properties re-walk the XML
+        frame_text = shape.text_frame.text if getattr(shape, 'has_text_frame', False) else ""
+        has_text = bool(frame_text.strip())
         
-        element = TextElement(
-            id=str(uuid.uuid4()),
-            content=text_frame.text,
-            x=x,
-            y=y,
-            width=width,
-            height=height,
-            fontSize=font_properties['fontSize'],
-            fontFamily=font_properties['fontFamily'],
-            fontWeight=font_properties['fontWeight'],
-            fontStyle=font_properties['fontStyle'],
-            textDecoration=font_properties['textDecoration'],
-            textAlign=font_properties['textAlign'],
-            color=font_properties['color'],
-            rotation=rotation
-        )
-        elements.append(element)
+        # Extract text from this shape
+        # Plain dicts: the pydantic models are skipped on this hot path
+        if has_text:
+            slide_elements.extend(extract_text_from_shape(shape, ctx=ctx, as_dict=True, frame_text=frame_text))
+        
+        # Extract shape (only if it doesn't have text content and is not a chart)
+        # This ensures we don't duplicate text boxes as shapes and don't extract chart shapes as rectangles
+        # Safely check if shape is a chart using helper function
+        elif not is_chart_shape(shape):
+            # FIX 5: Handle GROUP shapes (Canva) - process children
+            if getattr(shape, 'shape_type', None) == MSO_SHAPE_TYPE.GROUP:
+                if hasattr(shape, 'shapes'):
+                    for child_shape in shape.shapes:
+                        # Skip chart children - they'll be extracted separately
+                        child_is_chart = is_chart_shape(child_shape)
+                        if child_is_chart:
+                            continue
+                        child_shape_elem = extract_shape_from_shape(child_shape, skip_if_has_text=True, ctx=ctx, as_dict=True)
+                        if child_shape_elem:
+                            slide_elements.append(child_shape_elem)
+            else:
+                # Text-free already established above
+                shape_element = extract_shape_from_shape(shape, skip_if_has_text=False, ctx=ctx, as_dict=True)
+                if shape_element:
+                    slide_elements.append(shape_element)
+    
+    # Scale every element's coordinates in one pass
+    scale_elements(slide_elements, scale_x, scale_y)
+    
+    # Also scale cell dimensions, font sizes and border widths
+    scale_table_cells(slide_tables, scale_x, scale_y)
     
-    return elements
+    # Extract charts from slide (separate extractor)
+    chart_elements = extract_charts_from_slide(slide, ctx.pptx_path, scale_x, scale_y, ctx=ctx)
+    slide_elements.extend(chart_elements)
+    
+    # Extract slide background properties
+    background_info = extract_slide_background(slide, slide_index=slide_idx, ctx=ctx)
+    
+    # --- BACKGROUND HANDLING ---
+    # NO background image elements are created for any background type
+    # Only backgroundColor and backgroundImage properties are set in slide_data
+    # No extra images are added to elements array
+    
+    # Create slide data with all required fields
+    slide_data = {
+        "id": _new_id(),
+        "elements": slide_elements,
+        "thumbnail": None,
+        # Legacy fields for backward compatibility
+        "backgroundColor": background_info.get("backgroundColor"),
+        "backgroundImage": background_info.get("backgroundImage"),
+        "backgroundSize": background_info.get("backgroundSize"),
+        "backgroundPosition": background_info.get("backgroundPosition"),
+        "backgroundRepeat": background_info.get("backgroundRepeat")
+    }
+    return slide_data
+
+
+def _extract_slide_range(pptx_path: str, start: int, stop: int, scale_x: float, scale_y: float) -> List[Dict[str, Any]]:
+    """Process-pool worker: open the deck and extract slides [start, stop)."""
+    with ExtractionContext(pptx_path) as ctx:
+        slides = ctx.prs.slides
+        return [_process_slide(slides[idx], idx, ctx, scale_x, scale_y) for idx in range(start, stop)]
+
+
+def _slide_ranges(slide_count: int, parts: int) -> List[Tuple[int, int]]:
+    """Split slide indices into at most `parts` contiguous, near-equal ranges."""
+    parts = max(1, min(parts, slide_count))
+    size, extra = divmod(slide_count, parts)
+    ranges = []
+    start = 0
+    for i in range(parts):
+        stop = start + size + (1 if i < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
 
 
-def extract_text_from_pptx(pptx_path: str) -> List[Dict[str, Any]]:
+def extract_text_from_pptx(pptx_path: str, max_workers: Optional[int] = None, parallel_threshold: int = PARALLEL_SLIDE_THRESHOLD) -> List[Dict[str, Any]]:
     """
     Extract all text elements from a PPTX file.
     Returns a list of slides, each containing text elements.
     All coordinates are scaled from PowerPoint points to Presentera canvas (1024×576).
-    """
-    from converter.utils.scaling import get_slide_dimensions, calculate_scale_factor, scale_element_coordinates
     
+    Decks with more than parallel_threshold slides (PARALLEL_SLIDE_THRESHOLD by
+    default) are split into slide ranges extracted in a process pool
+    (max_workers defaults to the CPU count; pass 1 to force serial extraction). The deck's ZIP and theme are opened and
+    parsed once per process through an ExtractionContext.
+    """
     prs = Presentation(pptx_path)
     
     # Get slide dimensions and calculate scale factors
     ppt_width, ppt_height = get_slide_dimensions(prs)
     scale_x, scale_y = calculate_scale_factor(ppt_width, ppt_height)
     
-    slides_data = []
-    
-    for slide_idx, slide in enumerate(prs.slides):
-        slide_elements = []
-        
-        # Iterate through all shapes on the slide
-        for shape_idx, shape in enumerate(slide.shapes):
-            # Check if shape is a table first (tables should be extracted separately)
-            if hasattr(shape, 'has_table') and shape.has_table:
-                table_element = extract_table_from_shape(shape, pptx_path=pptx_path)
-                if table_element:
-                    table_dict = table_element.model_dump()
-                    # Scale table element coordinates
-                    table_dict = scale_element_coordinates(table_dict, scale_x, scale_y)
-                    # Also scale cell dimensions and round to nearest integer
-                    if 'cellWidth' in table_dict:
-                        table_dict['cellWidth'] = round(table_dict['cellWidth'] * scale_x)
-                    if 'cellHeight' in table_dict:
-                        table_dict['cellHeight'] = round(table_dict['cellHeight'] * scale_y)
-                    # Scale cell font sizes and border widths and round to nearest integer
-                    if 'data' in table_dict:
-                        for row in table_dict['data']:
-                            for cell in row:
-                                if 'fontSize' in cell:
-                                    cell['fontSize'] = round(cell['fontSize'] * scale_x)
-                                if 'borderWidth' in cell:
-                                    cell['borderWidth'] = round(cell['borderWidth'] * scale_x)
-                    slide_elements.append(table_dict)
-                    continue  # Skip other extraction for table shapes
-            
-            # Extract image (images are separate from text/shapes)
-            image_element = extract_image_from_shape(shape)
-            if image_element:
-                image_dict = image_element.model_dump()
-                # Scale image element coordinates
-                image_dict = scale_element_coordinates(image_dict, scale_x, scale_y)
-                slide_elements.append(image_dict)
-                continue  # Skip text/shape extraction for image shapes
-            
-            # Extract text from this shape
-            text_elements = extract_text_from_shape(shape, pptx_path=pptx_path)
-            # Convert TextElement objects to dictionaries and scale
-            for text_elem in text_elements:
-                text_dict = text_elem.model_dump()
-                # Scale text element coordinates
-                text_dict = scale_element_coordinates(text_dict, scale_x, scale_y)
-                slide_elements.append(text_dict)
-            
-            # Extract shape (only if it doesn't have text content and is not a chart)
-            # This ensures we don't duplicate text boxes as shapes and don't extract chart shapes as rectangles
-            has_text = hasattr(shape, 'has_text_frame') and shape.has_text_frame and shape.text_frame.text.strip()
-            # Safely check if shape is a chart using helper function
-            from converter.utils.chart_extractor import is_chart_shape
-            is_chart = is_chart_shape(shape)
-            
-            if not has_text and not is_chart:
-                # FIX 5: Handle GROUP shapes (Canva) - process children
-                if hasattr(shape, 'shape_type') and shape.shape_type == MSO_SHAPE_TYPE.GROUP:
-                    if hasattr(shape, 'shapes'):
-                        for child_shape in shape.shapes:
-                            # Skip chart children - they'll be extracted separately
-                            child_is_chart = is_chart_shape(child_shape)
-                            if child_is_chart:
-                                continue
-                            child_shape_elem = extract_shape_from_shape(child_shape, skip_if_has_text=True, pptx_path=pptx_path)
-                            if child_shape_elem:
-                                child_dict = child_shape_elem.model_dump()
-                                # Scale shape element coordinates
-                                child_dict = scale_element_coordinates(child_dict, scale_x, scale_y)
-                                slide_elements.append(child_dict)
-                else:
-                    shape_element = extract_shape_from_shape(shape, skip_if_has_text=True, pptx_path=pptx_path)
-                    if shape_element:
-                        shape_dict = shape_element.model_dump()
-                        # Scale shape element coordinates
-                        shape_dict = scale_element_coordinates(shape_dict, scale_x, scale_y)
-                        slide_elements.append(shape_dict)
-        
-        # Extract charts from slide (separate extractor)
-        from converter.utils.chart_extractor import extract_charts_from_slide
-        chart_elements = extract_charts_from_slide(slide, pptx_path, scale_x, scale_y)
-        slide_elements.extend(chart_elements)
-        
-        # Extract slide background properties
-        background_info = extract_slide_background(slide, pptx_path=pptx_path, slide_index=slide_idx)
-        
-        # --- BACKGROUND HANDLING ---
-        # NO background image elements are created for any background type
-        # Only backgroundColor and backgroundImage properties are set in slide_data
-        # No extra images are added to elements array
-        
-        # Create slide data with all required fields
-        slide_data = {
-            "id": str(uuid.uuid4()),
-            "elements": slide_elements,
-            "thumbnail": None,
-            # Legacy fields for backward compatibility
-            "backgroundColor": background_info.get("backgroundColor"),
-            "backgroundImage": background_info.get("backgroundImage"),
-            "backgroundSize": background_info.get("backgroundSize"),
-            "backgroundPosition": background_info.get("backgroundPosition"),
-            "backgroundRepeat": background_info.get("backgroundRepeat")
-        }
-        slides_data.append(slide_data)
+    slide_count = len(prs.slides)
+    workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+    if workers > 1 and slide_count > parallel_threshold:
+        ranges = _slide_ranges(slide_count, workers)
+        with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+            futures = [
+                executor.submit(_extract_slide_range, pptx_path, start, stop, scale_x, scale_y)
+                for start, stop in ranges
+            ]
+            return [slide_data for future in futures for slide_data in future.result()]
     
-    return slides_data
+    return list(_iter_slides(pptx_path, prs, scale_x, scale_y))
+
+
+def iter_slides(pptx_path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Serially extract a PPTX file one slide at a time.
+    Yields the same slide dicts as extract_text_from_pptx, in order, so callers
+    can encode or stop early without holding the whole deck.
+    """
+    prs = Presentation(pptx_path)
+    scale_x, scale_y = calculate_scale_factor(*get_slide_dimensions(prs))
+    yield from _iter_slides(pptx_path, prs, scale_x, scale_y)
+
+
+def _iter_slides(pptx_path: str, prs, scale_x: float, scale_y: float) -> Iterator[Dict[str, Any]]:
+    with ExtractionContext(pptx_path, prs) as ctx:
+        for slide_idx, slide in enumerate(prs.slides):
+            yield _process_slide(slide, slide_idx, ctx, scale_x, scale_y)
 
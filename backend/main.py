@@ -3,16 +3,159 @@ FastAPI application for PPTX to JSON conversion.
 Extracts text, shapes, images, and background colors from PowerPoint files.
 """
 from fastapi import FastAPI, UploadFile, File, HTTPException
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import JSONResponse, FileResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.background import BackgroundTask
+import asyncio
 import tempfile
 import os
 import json
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
 from datetime import datetime
-from converter.utils.text_extractor import extract_text_from_pptx
+from typing import Iterable, Iterator
+try:
+    import orjson  # Optional, much faster JSON encoding when installed
+except ImportError:
+    orjson = None
+from converter.utils.text_extractor import iter_slides
 from converter.schemas.slide_schema import Presentation, Slide, TextElement
 
+logger = logging.getLogger(__name__)
+
+# Uploads are copied to disk in chunks of this size (1 MiB)
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Conversions are CPU-bound; run them in worker processes off the event loop.
+# Each worker holds a whole deck in memory, so keep the pool small by default
+# (the Render free plan has 512 MB); override with the EXTRACT_WORKERS env var.
+DEFAULT_EXTRACT_WORKERS = 2
+
+
+def _extract_workers_from_env() -> int:
+    """EXTRACT_WORKERS as a positive int capped at the CPU count; bad values fall back to the default."""
+    value = os.getenv("EXTRACT_WORKERS", "")
+    try:
+        workers = int(value) if value.strip() else DEFAULT_EXTRACT_WORKERS
+    except ValueError:
+        logger.error("EXTRACT_WORKERS=%r is not an integer; using %d", value, DEFAULT_EXTRACT_WORKERS)
+        workers = DEFAULT_EXTRACT_WORKERS
+    return max(1, min(workers, os.cpu_count() or 1))
+
+
+EXTRACT_WORKERS = _extract_workers_from_env()
+
+# Created by lifespan() on startup and rebuilt if a worker dies
+extract_pool = None
+
+
+def _new_extract_pool() -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(max_workers=EXTRACT_WORKERS)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global extract_pool
+    extract_pool = _new_extract_pool()
+    try:
+        yield
+    finally:
+        extract_pool.shutdown(wait=True, cancel_futures=True)
+        extract_pool = None
+
+
+def _replace_broken_pool(pool: ProcessPoolExecutor) -> None:
+    """Swap in a fresh pool unless another request already replaced this broken one."""
+    global extract_pool
+    if extract_pool is pool:
+        pool.shutdown(wait=False, cancel_futures=True)
+        extract_pool = _new_extract_pool()
+
+
+async def run_extraction(pptx_path: str, json_path: str, exported_at: str) -> None:
+    """
+    Run convert_to_json_file in the worker pool.
+    A worker that crashes (e.g. killed for running out of memory) breaks the whole
+    pool. A deck whose conversion was running when that happened is only retried if
+    another request already replaced the pool; otherwise this request replaces it
+    and fails with 503 instead of rerunning a deck that probably crashed it.
+    """
+    pool = extract_pool
+    try:
+        future = pool.submit(convert_to_json_file, pptx_path, json_path, exported_at)
+    except BrokenProcessPool:
+        # Broken before this deck was submitted, so it cannot be the cause
+        _replace_broken_pool(pool)
+        pool = extract_pool
+        future = pool.submit(convert_to_json_file, pptx_path, json_path, exported_at)
+    
+    try:
+        await asyncio.wrap_future(future)
+        return
+    except BrokenProcessPool:
+        if extract_pool is pool:
+            _replace_broken_pool(pool)
+            raise HTTPException(
+                status_code=503,
+                detail="A conversion worker crashed while processing this file. Please try again later."
+            )
+    # Collateral failure: another request already replaced the broken pool
+    await asyncio.wrap_future(extract_pool.submit(convert_to_json_file, pptx_path, json_path, exported_at))
+
+
+def _dumps(obj) -> bytes:
+    """UTF-8 JSON with 2-space indentation (orjson when installed); downloads are read by hand."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def iter_slide_chunks(pptx_path: str) -> Iterator[bytes]:
+    """
+    Extract a PPTX file one slide at a time and encode each slide as its own
+    JSON chunk, already indented to its depth inside the document's "slides" array.
+    """
+    for slide in iter_slides(pptx_path):
+        # JSON strings never contain raw newlines, so re-indenting line by line is safe
+        yield b'    ' + _dumps(slide).replace(b'\n', b'\n    ')
+
+
+def iter_json_document(slide_chunks: Iterable[bytes], exported_at: str) -> Iterator[bytes]:
+    """
+    Yield the response document (slides, currentSlideIndex, version, exportedAt)
+    piece by piece around the pre-encoded slide chunks. The bytes match encoding
+    the whole document at once with indent=2.
+    """
+    slide_chunks = iter(slide_chunks)
+    first = next(slide_chunks, None)
+    if first is None:
+        yield b'{\n  "slides": [],'
+    else:
+        yield b'{\n  "slides": [\n'
+        yield first
+        for chunk in slide_chunks:
+            yield b',\n'
+            yield chunk
+        yield b'\n  ],'
+    yield b'\n  "currentSlideIndex": 0,\n  "version": "1.0",\n  "exportedAt": ' + _dumps(exported_at) + b'\n}'
+
+
+def convert_to_json_file(pptx_path: str, json_path: str, exported_at: str) -> None:
+    """
+    Convert a PPTX file into the response document at json_path.
+    Runs inside extract_pool and encodes one slide at a time straight to disk, so
+    neither the worker nor the server ever holds the whole encoded document;
+    the response then streams the file back.
+    """
+    with open(json_path, 'wb') as f:
+        for piece in iter_json_document(iter_slide_chunks(pptx_path), exported_at):
+            f.write(piece)
+
+
 app = FastAPI(
+    lifespan=lifespan,
     title="PPTX to JSON Converter API",
     description="""
     Convert PowerPoint (.pptx) files to Presentera-style JSON format.
@@ -129,39 +272,39 @@ async def convert_pptx(
     
     # Create temporary file to save uploaded PPTX
     temp_file = None
+    json_path = None
     try:
-        # Save uploaded file temporarily
+        # Save uploaded file temporarily, streaming it without buffering the whole upload
         with tempfile.NamedTemporaryFile(delete=False, suffix='.pptx') as temp_file:
-            content = await file.read()
-            temp_file.write(content)
             temp_file_path = temp_file.name
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                temp_file.write(chunk)
         
-        # Extract text from PPTX
-        slides_data = extract_text_from_pptx(temp_file_path)
-        
-        # Build response with all required fields
-        response_data = {
-            "slides": slides_data,
-            "currentSlideIndex": 0,
-            "version": "1.0",
-            "exportedAt": datetime.utcnow().isoformat() + "Z"
-        }
+        # Extract the PPTX in a worker process, which writes the JSON document to disk
+        fd, json_path = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        exported_at = datetime.utcnow().isoformat() + "Z"
+        await run_extraction(temp_file_path, json_path, exported_at)
         
         # Always return as downloadable JSON file
         # Generate output filename based on input filename
         base_name = os.path.splitext(file.filename)[0]
         output_filename = f"{base_name}.json"
         
-        # Convert to JSON string
-        json_str = json.dumps(response_data, indent=2, ensure_ascii=False)
-        
-        return Response(
-            content=json_str,
+        # Stream the document from disk; the file is removed once it has been sent
+        response = FileResponse(
+            json_path,
             media_type="application/json",
             headers={
                 "Content-Disposition": f'attachment; filename="{output_filename}"'
-            }
+            },
+            background=BackgroundTask(os.unlink, json_path)
         )
+        json_path = None
+        return response
+    
+    except HTTPException:
+        raise
     
     except Exception as e:
         raise HTTPException(
@@ -170,9 +313,11 @@ async def convert_pptx(
         )
     
     finally:
-        # Clean up temporary file
+        # Clean up temporary files (the JSON output only if it was not handed to the response)
         if temp_file and os.path.exists(temp_file_path):
             os.unlink(temp_file_path)
+        if json_path and os.path.exists(json_path):
+            os.unlink(json_path)
 
 
 @app.get("/health")
@@ -4,6 +4,10 @@ Usage: python save_json.py <path_to_pptx_file> [output_file.json]
 """
 import sys
 import json
+try:
+    import orjson  # Optional, much faster JSON encoding when installed
+except ImportError:
+    orjson = None
 from converter.utils.text_extractor import extract_text_from_pptx
 from datetime import datetime
 
@@ -26,9 +30,13 @@ if __name__ == "__main__":
             "exportedAt": datetime.utcnow().isoformat() + "Z"
         }
         
-        # Save to file
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
+        # Encode the whole document up front and save it with a single write
+        if orjson is not None:
+            json_bytes = orjson.dumps(result, option=orjson.OPT_INDENT_2)
+        else:
+            json_bytes = json.dumps(result, indent=2, ensure_ascii=False).encode('utf-8')
+        with open(output_file, 'wb') as f:
+            f.write(json_bytes)
         
         print(f"\n✓ JSON saved to: {output_file}")
         print(f"✓ Total slides: {len(slides_data)}")
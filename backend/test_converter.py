@@ -1,50 +1,254 @@
 """
 Simple test script for the PPTX to JSON converter.
-Usage: python test_converter.py <path_to_pptx_file>
+Usage: python test_converter.py <path_to_pptx_file> [--print-json] [--output FILE] [--workers N]
+
+Compact JSON is saved to --output (output.json); --print-json also pretty-prints
+it to stdout. Decks with more than PARALLEL_MIN_SLIDES slides are extracted in
+N worker processes (default: CPU count; --workers 1 forces serial extraction).
+Extracted slides are cached in --cache-dir keyed by the deck's SHA-256 (and the
+converter version and sources' mtimes); pass --no-cache to always re-extract.
+--stream extracts and writes one slide at a time instead (serial, uncached).
+--cpus pins the process (and its workers) to a CPU list such as 0-3 on Linux.
 """
+import argparse
+import faulthandler
+import hashlib
+import os
 import sys
 import json
-from converter.utils.text_extractor import extract_text_from_pptx
+import traceback
+from contextlib import contextmanager
+from operator import itemgetter
+from time import gmtime, strftime
+try:
+    import orjson  # Optional, much faster JSON encoding when installed
+except ImportError:
+    orjson = None
+from converter.utils.cache_key import converter_sources_stamp
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python test_converter.py <path_to_pptx_file>")
-        sys.exit(1)
+# The output file is written through a buffer of this size (1 MiB)
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+# Slide count above which extraction is spread over worker processes
+PARALLEL_MIN_SLIDES = 4
+
+# Default directory for cached extraction results
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+
+
+def _parse_cpu_list(text: str) -> set:
+    """Parse a taskset-style CPU list ("0-3,8") into a set of CPU ids."""
+    cpus = set()
+    try:
+        for part in text.split(","):
+            first, _, last = part.partition("-")
+            cpus.update(range(int(first), int(last or first) + 1))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid CPU list: {text!r}")
+    if not cpus:
+        raise argparse.ArgumentTypeError(f"invalid CPU list: {text!r}")
+    return cpus
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Convert a PPTX file to Presentera JSON.")
+    parser.add_argument("pptx_path", help="path to the .pptx file")
+    parser.add_argument("--print-json", "--verbose", dest="print_json", action="store_true",
+                        help="also pretty-print the JSON to stdout")
+    parser.add_argument("--output", default="output.json", help="output file (default: output.json)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes for large decks (default: CPU count)")
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help="extraction cache directory")
+    parser.add_argument("--no-cache", action="store_true", help="ignore and don't write the cache")
+    parser.add_argument("--cpus", type=_parse_cpu_list, default=None,
+                        help="pin to these CPUs, e.g. 0-3 or 0,2,4 (Linux only)")
+    parser.add_argument("--stream", action="store_true",
+                        help="extract and write slides one at a time (constant memory; serial, uncached)")
+    args = parser.parse_args(argv)
+    if args.stream and args.print_json:
+        parser.error("--stream cannot be combined with --print-json")
+    return args
+
+
+def _dumps_compact(obj) -> bytes:
+    """Compact UTF-8 JSON (orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _dumps_pretty(obj) -> bytes:
+    """UTF-8 JSON with 2-space indentation (orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def write_streamed(f, slides, exported_at: str):
+    """
+    Write the output document to binary file f, encoding slides one at a time.
+    Returns (slide_count, element_count).
+    """
+    slide_count = element_count = 0
+    f.write(b'{"slides":[')
+    for slide in slides:
+        if slide_count:
+            f.write(b',')
+        f.write(_dumps_compact(slide))
+        slide_count += 1
+        element_count += len(slide['elements'])
+    f.write(b'],"currentSlideIndex":0,"version":"1.0","exportedAt":' + _dumps_compact(exported_at) + b'}')
+    return slide_count, element_count
+
+
+def _cache_path(pptx_path: str, cache_dir: str) -> str:
+    """Cache file for a deck, keyed by its content hash and the converter sources."""
+    digest = hashlib.sha256()
+    with open(pptx_path, "rb") as f:
+        while chunk := f.read(OUTPUT_BUFFER_SIZE):
+            digest.update(chunk)
+    # Editing the extractor (or bumping CACHE_VERSION) invalidates cached results
+    digest.update(converter_sources_stamp().encode("utf-8"))
+    return os.path.join(cache_dir, digest.hexdigest() + ".json")
+
+
+def load_slides(pptx_path: str, workers=None, cache_dir=None):
+    """
+    Extract slides from a PPTX, reusing a cached result for unchanged input.
+    cache_dir=None disables the cache.
+    """
+    # Imported here so importing this module stays cheap (python-pptx, lxml, PIL)
+    from converter.utils.text_extractor import extract_text_from_pptx
     
-    pptx_path = sys.argv[1]
+    if cache_dir is None:
+        return extract_text_from_pptx(pptx_path, max_workers=workers, parallel_threshold=PARALLEL_MIN_SLIDES)
     
+    cache_path = _cache_path(pptx_path, cache_dir)
     try:
-        print(f"Extracting text from: {pptx_path}")
-        slides_data = extract_text_from_pptx(pptx_path)
-        
-        from datetime import datetime
+        with open(cache_path, "rb") as f:
+            return orjson.loads(f.read()) if orjson is not None else json.load(f)
+    except (OSError, ValueError):
+        pass
+    
+    slides_data = extract_text_from_pptx(pptx_path, max_workers=workers, parallel_threshold=PARALLEL_MIN_SLIDES)
+    
+    # Write atomically so an interrupted run never leaves a partial cache file
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_dumps_compact(slides_data))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+    
+    return slides_data
+
+
+def _report_error(exc_type, exc, tb) -> None:
+    """sys.excepthook: report an application error briefly (exit status stays 1)."""
+    if not issubclass(exc_type, Exception):
+        sys.__excepthook__(exc_type, exc, tb)
+        return
+    print(f"Error: {exc}")
+    traceback.print_exception(exc_type, exc, tb, limit=5, chain=False)
+
+
+@contextmanager
+def _atomic_open(path: str, mode: str = 'wb', **kwargs):
+    """
+    Open a temp file next to path and move it into place with os.replace on success,
+    so readers never see a partially written file.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, mode, **kwargs) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def run(pptx_path: str, output: str = "output.json", workers=None, cache_dir=CACHE_DIR,
+        print_json: bool = False, stream: bool = False):
+    """
+    Convert one PPTX file and save the JSON document to output.
+    Importable for batch use; returns (slide_count, element_count).
+    """
+    # One timestamp per conversion
+    exported_at = strftime("%Y-%m-%dT%H:%M:%SZ", gmtime())
+    
+    print(f"Extracting text from: {pptx_path}")
+    if stream:
+        from converter.utils.text_extractor import iter_slides
+        with _atomic_open(output, 'wb', buffering=OUTPUT_BUFFER_SIZE) as f:
+            slide_count, total_elements = write_streamed(f, iter_slides(pptx_path), exported_at)
+    else:
+        slides_data = load_slides(pptx_path, workers, cache_dir)
         
         result = {
             "slides": slides_data,
             "currentSlideIndex": 0,
             "version": "1.0",
-            "exportedAt": datetime.utcnow().isoformat() + "Z"
+            "exportedAt": exported_at
         }
         
-        # Pretty print JSON
-        print("\n" + "="*50)
-        print("EXTRACTED JSON:")
-        print("="*50)
-        print(json.dumps(result, indent=2))
-        
-        # Save to file
-        output_file = "output.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2)
+        # Save compact JSON to file; indentation is only for the human-facing stdout view
+        if orjson is not None:
+            with _atomic_open(output, 'wb') as f:
+                f.write(_dumps_compact(result))
+        else:
+            # Stream straight into a large write buffer; no full JSON string is built
+            with _atomic_open(output, 'w', encoding='utf-8', buffering=OUTPUT_BUFFER_SIZE) as f:
+                json.dump(result, f, ensure_ascii=False, separators=(',', ':'))
         
-        print(f"\n✓ JSON saved to: {output_file}")
-        print(f"✓ Total slides: {len(slides_data)}")
-        total_elements = sum(len(slide['elements']) for slide in slides_data)
-        print(f"✓ Total text elements: {total_elements}")
+        # Pretty print JSON
+        if print_json:
+            pretty = _dumps_pretty(result)
+            print("\n" + "="*50)
+            print("EXTRACTED JSON:")
+            print("="*50)
+            sys.stdout.flush()
+            sys.stdout.buffer.write(pretty)
+            sys.stdout.buffer.write(b"\n")
+            sys.stdout.buffer.flush()
         
-    except Exception as e:
-        print(f"Error: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
+        slide_count = len(slides_data)
+        total_elements = sum(map(len, map(itemgetter('elements'), slides_data)))
+    
+    sys.stdout.write(
+        f"\n✓ JSON saved to: {output}\n"
+        f"✓ Total slides: {slide_count}\n"
+        f"✓ Total text elements: {total_elements}\n"
+    )
+    return slide_count, total_elements
 
+
+if __name__ == "__main__":
+    # Dump C-level tracebacks on hard crashes (e.g. segfaults in lxml)
+    faulthandler.enable(file=sys.stderr)
+    sys.excepthook = _report_error
+    args = parse_args()
+    if args.cpus:
+        # Keep extraction (and forked workers) on one set of cores / NUMA node
+        try:
+            os.sched_setaffinity(0, args.cpus)
+        except AttributeError:
+            print("Warning: --cpus is not supported on this platform", file=sys.stderr)
+        except OSError as e:
+            sys.exit(f"Error: cannot pin to CPUs {sorted(args.cpus)}: {e}")
+        else:
+            if args.workers is None:
+                args.workers = len(args.cpus)
+    run(
+        args.pptx_path,
+        output=args.output,
+        workers=args.workers,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        print_json=args.print_json,
+        stream=args.stream,
+    )
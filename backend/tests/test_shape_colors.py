@@ -0,0 +1,72 @@
+"""
+Parity checks for the packed-int tint/shade path in shape_extractor against the
+original per-channel apply_tint/apply_shade formulas.
+
+Run from backend/: python -m unittest discover tests
+"""
+import unittest
+
+from converter.utils.shape_extractor import _apply_tint_shade, apply_shade, apply_tint
+
+
+def _reference_tint(hex_color, tint_val):
+    if hex_color is None or tint_val is None:
+        return hex_color
+    try:
+        t = tint_val / 100000.0
+        r, g, b = (int(hex_color[i:i + 2], 16) for i in (1, 3, 5))
+        return '#' + ''.join(f'{int(round(c + (255 - c) * t)):02x}' for c in (r, g, b))
+    except (ValueError, TypeError):
+        return hex_color
+
+
+def _reference_shade(hex_color, shade_val):
+    if hex_color is None or shade_val is None:
+        return hex_color
+    try:
+        s = shade_val / 100000.0
+        r, g, b = (int(hex_color[i:i + 2], 16) for i in (1, 3, 5))
+        return '#' + ''.join(f'{int(round(c * (1 - s))):02x}' for c in (r, g, b))
+    except (ValueError, TypeError):
+        return hex_color
+
+
+COLORS = ['#000000', '#ffffff', '#4472c4', '#4472C4', '#ED7D31', '#a5a5a5ff', '#abc', 'nothex', None]
+VALUES = [0, 1, 25000, 40000, 50000, 75000, 99999, 100000]
+
+
+class TintShadeParityTest(unittest.TestCase):
+    def test_apply_tint_matches_reference(self):
+        for color in COLORS:
+            for val in VALUES + [None]:
+                with self.subTest(color=color, tint=val):
+                    self.assertEqual(apply_tint(color, val), _reference_tint(color, val))
+
+    def test_apply_shade_matches_reference(self):
+        for color in COLORS:
+            for val in VALUES + [None]:
+                with self.subTest(color=color, shade=val):
+                    self.assertEqual(apply_shade(color, val), _reference_shade(color, val))
+
+    def test_combined_matches_chained_reference(self):
+        for color in COLORS:
+            for tint in VALUES:
+                for shade in VALUES:
+                    with self.subTest(color=color, tint=tint, shade=shade):
+                        expected = _reference_shade(_reference_tint(color, tint), shade)
+                        self.assertEqual(_apply_tint_shade(color, tint, shade), expected)
+
+    def test_zero_modifier_normalises_case(self):
+        self.assertEqual(apply_tint('#4472C4', 0), '#4472c4')
+        self.assertEqual(apply_shade('#4472C4', 0), '#4472c4')
+
+    def test_full_modifier(self):
+        self.assertEqual(apply_tint('#4472C4', 100000), '#ffffff')
+        self.assertEqual(apply_shade('#4472C4', 100000), '#000000')
+
+    def test_no_modifier_returns_input(self):
+        self.assertEqual(_apply_tint_shade('#4472C4', None, None), '#4472C4')
+
+
+if __name__ == '__main__':
+    unittest.main()
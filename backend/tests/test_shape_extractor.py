@@ -0,0 +1,174 @@
+"""
+The streaming slide-XML path in _extract_shapes_from_pptx (raw p:sp / p:cxnSp
+elements wrapped without a part) against extracting the same deck shape by shape
+through python-pptx, and the opt-in JSON cache in extract_shapes_from_pptx.
+
+Run from backend/: python -m unittest discover tests
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from pptx import Presentation
+from pptx.dml.color import RGBColor
+from pptx.enum.shapes import MSO_CONNECTOR, MSO_SHAPE
+from pptx.util import Inches, Pt
+
+from converter.utils import shape_extractor
+from converter.utils.shape_extractor import (
+    SHAPE_CACHE_MAX_ENTRIES,
+    _extract_shapes_from_pptx,
+    extract_shape_from_shape,
+    extract_shapes_from_pptx,
+)
+
+
+def _build_deck(path):
+    prs = Presentation()
+
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    rect = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, Inches(1), Inches(1), Inches(2), Inches(1))
+    rect.fill.solid()
+    rect.fill.fore_color.rgb = RGBColor(0x12, 0x34, 0x56)
+    rect.line.color.rgb = RGBColor(0x00, 0x00, 0x00)
+    rect.line.width = Pt(3)
+    slide.shapes.add_shape(MSO_SHAPE.OVAL, Inches(4), Inches(1), Inches(1), Inches(1))
+    connector = slide.shapes.add_connector(MSO_CONNECTOR.STRAIGHT, Inches(1), Inches(3), Inches(5), Inches(3))
+    connector.line.color.rgb = RGBColor(0xFF, 0x00, 0x00)
+    builder = slide.shapes.build_freeform(Inches(1), Inches(4))
+    builder.add_line_segments([(Inches(2), Inches(4)), (Inches(2), Inches(5)), (Inches(1), Inches(5))])
+    freeform = builder.convert_to_shape()
+    freeform.fill.solid()
+    freeform.fill.fore_color.rgb = RGBColor(0x00, 0x80, 0x00)
+    group = slide.shapes.add_group_shape()
+    group.shapes.add_shape(MSO_SHAPE.RECTANGLE, Inches(6), Inches(4), Inches(1), Inches(1))
+    slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, Inches(6), Inches(1), Inches(1), Inches(1)).text = "has text"
+
+    # Empty placeholders have no xfrm and inherit their position from the layout
+    slide = prs.slides.add_slide(prs.slide_layouts[1])
+    slide.shapes.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE, Inches(1), Inches(1), Inches(2), Inches(2))
+
+    prs.save(path)
+
+
+def _python_pptx_shapes(pptx_path):
+    """Reference: every top-level shape through python-pptx, validated one by one."""
+    all_slides_shapes = []
+    for slide in Presentation(pptx_path).slides:
+        slide_shapes = []
+        for shape in slide.shapes:
+            element = extract_shape_from_shape(shape)
+            if element:
+                slide_shapes.append(element.model_dump())
+        all_slides_shapes.append(slide_shapes)
+    return all_slides_shapes
+
+
+def _without_ids(all_slides_shapes):
+    return [[{k: v for k, v in shape.items() if k != 'id'} for shape in slide] for slide in all_slides_shapes]
+
+
+class StreamingShapeExtractionTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.mkdtemp()
+        cls.pptx_path = os.path.join(cls.tmp_dir, "shapes.pptx")
+        _build_deck(cls.pptx_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_dir, ignore_errors=True)
+
+    def test_matches_python_pptx_path(self):
+        streamed = _extract_shapes_from_pptx(self.pptx_path)
+        self.assertEqual(_without_ids(streamed), _without_ids(_python_pptx_shapes(self.pptx_path)))
+
+    def test_extracted_shapes(self):
+        slides = _without_ids(_extract_shapes_from_pptx(self.pptx_path))
+        self.assertEqual(len(slides), 2)
+        # Rectangle, oval and freeform; the connector, group and text shape are skipped
+        self.assertEqual([shape['shapeType'] for shape in slides[0]], ['rectangle', 'circle', 'square'])
+        self.assertEqual(slides[0][0], {
+            'type': 'shape', 'shapeType': 'rectangle', 'x': 72, 'y': 72, 'width': 144, 'height': 72,
+            'fillColor': '#123456', 'borderColor': '#000000', 'borderWidth': 3, 'rotation': 0,
+        })
+        self.assertEqual(slides[0][2]['fillColor'], '#008000')
+        # Placeholders resolved through python-pptx keep the layout's position
+        self.assertEqual([shape['shapeType'] for shape in slides[1]], ['rectangle', 'rectangle', 'roundedRectangle'])
+        self.assertEqual((slides[1][0]['x'], slides[1][0]['y']), (36, 22))
+
+    def test_ids_are_unique(self):
+        ids = [shape['id'] for slide in _extract_shapes_from_pptx(self.pptx_path) for shape in slide]
+        self.assertEqual(len(ids), len(set(ids)))
+
+
+class ShapeCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp_dir, "cache")
+        self.pptx_path = os.path.join(self.tmp_dir, "deck.pptx")
+        with open(self.pptx_path, "wb") as f:
+            f.write(b"deck")
+        # Each real extraction returns a distinct result, so hits are recognisable
+        self.extract = mock.patch.object(
+            shape_extractor, "_extract_shapes_from_pptx",
+            side_effect=lambda path: [[{"call": self.extract.call_count}]]
+        ).start()
+        self.addCleanup(mock.patch.stopall)
+        self.addCleanup(shutil.rmtree, self.tmp_dir, ignore_errors=True)
+
+    def test_disabled_by_default(self):
+        extract_shapes_from_pptx(self.pptx_path)
+        extract_shapes_from_pptx(self.pptx_path)
+        self.assertEqual(self.extract.call_count, 2)
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+    def test_hit(self):
+        first = extract_shapes_from_pptx(self.pptx_path, cache_dir=self.cache_dir)
+        second = extract_shapes_from_pptx(self.pptx_path, cache_dir=self.cache_dir)
+        self.assertEqual(self.extract.call_count, 1)
+        self.assertEqual(second, first)
+
+    def test_mtime_change_invalidates(self):
+        extract_shapes_from_pptx(self.pptx_path, cache_dir=self.cache_dir)
+        stat = os.stat(self.pptx_path)
+        os.utime(self.pptx_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        extract_shapes_from_pptx(self.pptx_path, cache_dir=self.cache_dir)
+        self.assertEqual(self.extract.call_count, 2)
+
+    def test_size_change_invalidates(self):
+        extract_shapes_from_pptx(self.pptx_path, cache_dir=self.cache_dir)
+        stat = os.stat(self.pptx_path)
+        with open(self.pptx_path, "ab") as f:
+            f.write(b"more")
+        # Same mtime, different size
+        os.utime(self.pptx_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        extract_shapes_from_pptx(self.pptx_path, cache_dir=self.cache_dir)
+        self.assertEqual(self.extract.call_count, 2)
+
+    def test_prunes_to_max_entries(self):
+        os.makedirs(self.cache_dir)
+        old_entries = []
+        for i in range(SHAPE_CACHE_MAX_ENTRIES):
+            path = os.path.join(self.cache_dir, f"old{i:03d}.json")
+            with open(path, "w") as f:
+                f.write("[]")
+            # Oldest first, all well before the new entry
+            os.utime(path, ns=(0, (i + 1) * 1_000_000_000))
+            old_entries.append(path)
+
+        extract_shapes_from_pptx(self.pptx_path, cache_dir=self.cache_dir)
+
+        entries = [name for name in os.listdir(self.cache_dir) if name.endswith(".json")]
+        self.assertEqual(len(entries), SHAPE_CACHE_MAX_ENTRIES)
+        self.assertFalse(os.path.exists(old_entries[0]))
+        self.assertTrue(os.path.exists(old_entries[1]))
+        # The new entry survived pruning and is served from the cache
+        extract_shapes_from_pptx(self.pptx_path, cache_dir=self.cache_dir)
+        self.assertEqual(self.extract.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,185 @@
+"""
+Cell dicts produced by extract_table_from_shape (the single-pass a:tbl walk in
+_extract_all_cells) for a small table built with python-pptx.
+
+Run from backend/: python -m unittest discover tests
+"""
+import copy
+import os
+import shutil
+import tempfile
+import unittest
+
+from pptx import Presentation
+from pptx.dml.color import RGBColor
+from pptx.enum.dml import MSO_THEME_COLOR
+from pptx.enum.text import PP_ALIGN
+from pptx.oxml import parse_xml
+from pptx.util import Inches, Pt
+
+from converter.schemas.slide_schema import TableElement
+from converter.utils.table_extractor import extract_table_from_shape
+
+_NS = 'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main"'
+
+
+def _cell(**overrides):
+    """Expected cell dict: extractor defaults plus overrides."""
+    cell = {
+        'text': '',
+        'bgColor': '#FFFFFF',
+        'textColor': '#000000',
+        'borderColor': '#FFFFFF',
+        'borderWidth': 2,
+        'fontSize': 12,
+        'fontFamily': 'Arial',
+        'fontWeight': 'normal',
+        'fontStyle': 'normal',
+        'textDecoration': 'none',
+        'align': 'left',
+    }
+    cell.update(overrides)
+    return cell
+
+
+def _build_deck(path):
+    """
+    4x3 table:
+        row 0: theme (accent1) fill | sRGB fill + styled run | preset fill, centered
+        row 1: explicit border + fill | identical tcPr | theme-colored text
+        row 2: empty cell | "Merged" spanning rows 2-3, cols 1-2
+        row 3: padded text | (spanned) | (spanned)
+    """
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    table = slide.shapes.add_table(4, 3, Inches(1), Inches(1), Inches(6), Inches(4)).table
+
+    cell = table.cell(0, 0)
+    cell.text = "Theme"
+    cell.fill.solid()
+    cell.fill.fore_color.theme_color = MSO_THEME_COLOR.ACCENT_1
+
+    cell = table.cell(0, 1)
+    cell.text = "Styled"
+    cell.fill.solid()
+    cell.fill.fore_color.rgb = RGBColor(0xFF, 0x00, 0x00)
+    font = cell.text_frame.paragraphs[0].runs[0].font
+    font.bold = True
+    font.italic = True
+    font.underline = True
+    font.size = Pt(20)
+    font.name = "Georgia"
+    font.color.rgb = RGBColor(0x11, 0x22, 0x33)
+
+    cell = table.cell(0, 2)
+    cell.text = "Preset"
+    cell.text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
+    cell._tc.get_or_add_tcPr().append(parse_xml(f'<a:solidFill {_NS}><a:prstClr val="blue"/></a:solidFill>'))
+
+    cell = table.cell(1, 0)
+    cell.text = "Bordered"
+    tc_pr = cell._tc.get_or_add_tcPr()
+    tc_pr.append(parse_xml(
+        f'<a:lnL {_NS} w="38100"><a:solidFill><a:srgbClr val="00FF00"/></a:solidFill></a:lnL>'
+    ))
+    tc_pr.append(parse_xml(f'<a:solidFill {_NS}><a:srgbClr val="123456"/></a:solidFill>'))
+
+    # Identical tcPr: served from the style cache with its subtree skipped
+    cell = table.cell(1, 1)
+    cell.text = "Same style"
+    if cell._tc.tcPr is not None:
+        cell._tc.remove(cell._tc.tcPr)
+    cell._tc.append(copy.deepcopy(tc_pr))
+
+    cell = table.cell(1, 2)
+    cell.text = "Theme text"
+    cell.text_frame.paragraphs[0].runs[0].font.color.theme_color = MSO_THEME_COLOR.ACCENT_2
+
+    table.cell(2, 1).merge(table.cell(3, 2))
+    table.cell(2, 1).text = "Merged"
+    table.cell(3, 0).text = " padded "
+
+    prs.save(path)
+
+
+class ExtractTableTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.mkdtemp()
+        cls.pptx_path = os.path.join(cls.tmp_dir, "table.pptx")
+        _build_deck(cls.pptx_path)
+        prs = Presentation(cls.pptx_path)
+        cls.shape = next(shape for shape in prs.slides[0].shapes if shape.has_table)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_dir, ignore_errors=True)
+
+    def test_table_geometry(self):
+        element = extract_table_from_shape(self.shape, self.pptx_path, as_dict=True)
+        self.assertEqual(element['type'], 'table')
+        self.assertEqual((element['x'], element['y'], element['width'], element['height']), (72, 72, 432, 288))
+        self.assertEqual((element['rows'], element['cols']), (4, 3))
+        self.assertEqual((element['cellWidth'], element['cellHeight']), (144, 72))
+        self.assertEqual(element['rotation'], 0)
+
+    def test_cell_dicts(self):
+        data = extract_table_from_shape(self.shape, self.pptx_path, as_dict=True)['data']
+
+        # Unstyled cells fall back to the row's colors (header / odd / even rows)
+        odd = {'bgColor': '#BBDEFB'}
+        even = {'bgColor': '#E3F2FD'}
+        expected = [
+            [
+                _cell(text='Theme', bgColor='#4f81bd'),
+                _cell(text='Styled', bgColor='#ff0000', textColor='#112233', fontSize=20, fontFamily='Georgia',
+                      fontWeight='bold', fontStyle='italic', textDecoration='underline'),
+                _cell(text='Preset', bgColor='#0000FF', align='center'),
+            ],
+            [
+                _cell(text='Bordered', bgColor='#123456', borderColor='#00ff00', borderWidth=3),
+                _cell(text='Same style', bgColor='#123456', borderColor='#00ff00', borderWidth=3),
+                _cell(text='Theme text', textColor='#c0504d', **odd),
+            ],
+            [
+                _cell(**even),
+                _cell(text='Merged', **even),
+                _cell(**even),
+            ],
+            [
+                _cell(text='padded', **odd),
+                _cell(**odd),
+                _cell(**odd),
+            ],
+        ]
+        self.assertEqual(len(data), len(expected))
+        for row_idx, (row, expected_row) in enumerate(zip(data, expected)):
+            for col_idx, (cell, expected_cell) in enumerate(zip(row, expected_row)):
+                with self.subTest(row=row_idx, col=col_idx):
+                    self.assertEqual(cell, expected_cell)
+            self.assertEqual(len(row), len(expected_row))
+
+    def test_scheme_colors_without_theme_mapping(self):
+        # No pptx_path: scheme colors can't be resolved, so the row fallbacks apply
+        data = extract_table_from_shape(self.shape, as_dict=True)['data']
+        self.assertEqual(data[0][0]['bgColor'], '#2196F3')
+        self.assertEqual(data[1][2]['textColor'], '#000000')
+        # sRGB and preset colors don't need the theme
+        self.assertEqual(data[0][1]['bgColor'], '#ff0000')
+        self.assertEqual(data[0][2]['bgColor'], '#0000FF')
+
+    def test_validated_element_matches_dict(self):
+        element = extract_table_from_shape(self.shape, self.pptx_path)
+        self.assertIsInstance(element, TableElement)
+        as_dict = extract_table_from_shape(self.shape, self.pptx_path, as_dict=True)
+        self.assertEqual(element.model_dump()['data'], as_dict['data'])
+
+    def test_non_table_shape(self):
+        prs = Presentation()
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        textbox = slide.shapes.add_textbox(Inches(1), Inches(1), Inches(2), Inches(1))
+        self.assertIsNone(extract_table_from_shape(textbox))
+
+
+if __name__ == '__main__':
+    unittest.main()